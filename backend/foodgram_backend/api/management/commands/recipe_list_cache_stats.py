@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.recipe.page_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Show hit and miss counters of the anonymous recipe list cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true', help='Reset the counters.'
+        )
+
+    def handle(self, *args, **options):
+        hits, misses = get_stats()
+        total = hits + misses
+        ratio = hits / total if total else 0
+        self.stdout.write(
+            f'hits: {hits}, misses: {misses}, hit ratio: {ratio:.1%}'
+        )
+        if options['reset']:
+            reset_stats()
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.recipe.reference import REFERENCE_TABLES, get_reference_data
+
+
+class Command(BaseCommand):
+    help = 'Fill the shared cache with the tag and ingredient payloads.'
+
+    def handle(self, *args, **options):
+        for name in REFERENCE_TABLES:
+            data = get_reference_data(name)
+            self.stdout.write(f'{name}: {len(data.items)} rows cached')
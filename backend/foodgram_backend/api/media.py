@@ -0,0 +1,41 @@
+from base64 import urlsafe_b64encode
+from functools import lru_cache
+import hashlib
+import time
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+
+@lru_cache(maxsize=4096)
+def _media_url(name, expires):
+    url = default_storage.url(name)
+    if not urlsplit(url).netloc:
+        url = settings.MEDIA_BASE_URL.rstrip('/') + url
+    if expires is None:
+        return url
+
+    # nginx secure_link: secure_link_md5 "$secure_link_expires$uri <key>"
+    # nginx hashes the decoded $uri.
+    path = unquote(urlsplit(url).path)
+    signature = urlsafe_b64encode(hashlib.md5(
+        f'{expires}{path} {settings.MEDIA_URL_SIGNING_KEY}'.encode()
+    ).digest()).decode().rstrip('=')
+    return f'{url}?md5={signature}&expires={expires}'
+
+
+def media_url(name):
+    """
+    Public URL of a stored file: MEDIA_BASE_URL plus the storage URL,
+    signed for nginx secure_link when MEDIA_URL_SIGNING_KEY is set.
+    Signed links expire at the end of the MEDIA_URL_SIGNING_TTL window
+    after the current one, so they can be memoized per window.
+    """
+    if not name:
+        return None
+    expires = None
+    if settings.MEDIA_URL_SIGNING_KEY:
+        ttl = settings.MEDIA_URL_SIGNING_TTL
+        expires = (int(time.time()) // ttl + 2) * ttl
+    return _media_url(name, expires)
@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from foodgram_backend.postgresql_pool.base import get_pool_stats
+
+
+class DatabasePoolStats(APIView):
+    """Counters of the connection pools of the serving process."""
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(get_pool_stats(), status=status.HTTP_200_OK)
@@ -1,5 +1,230 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Row count of an unfiltered queryset from the planner statistics, None
+    when they are not available.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # -1 means the table has never been analyzed.
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def approximate_count(queryset, use_cache=True):
+    """
+    (count, exact) of a queryset. Unfiltered tables are estimated from
+    pg_class, filtered querysets are counted up to PAGINATION_COUNT_CAP
+    rows. With use_cache the count is kept for
+    PAGINATION_COUNT_CACHE_TIMEOUT seconds, and a count served from the
+    cache is not exact: the rows may have changed since.
+    """
+    cap = settings.PAGINATION_COUNT_CAP
+    if not queryset.query.where:
+        estimate = estimate_count(queryset)
+        # Small tables are cheaper to count than to misreport.
+        if estimate is not None and estimate > cap:
+            return estimate, False
+
+    try:
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    except EmptyResultSet:
+        return 0, True
+    cache_key = "pagination_count:" + hashlib.sha256(
+        repr((queryset.db, sql, params)).encode()
+    ).hexdigest()
+    if use_cache:
+        count = cache.get(cache_key)
+        if count is not None:
+            return count, False
+
+    count = queryset.order_by()[: cap + 1].count()
+    if use_cache:
+        cache.set(
+            cache_key, min(count, cap), settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+    return (cap, False) if count > cap else (count, True)
+
+
+class ApproximatePage(Page):
+    def __init__(self, object_list, number, paginator, has_next=None):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        if self._has_next is None:
+            return super().has_next()
+        return self._has_next
+
+
+class ApproximateCountPaginator(DjangoPaginator):
+    """
+    Paginator on top of approximate_count(). While the count is not exact
+    any page number is accepted and the next page is detected by reading
+    one extra row; the last page makes the count exact.
+    """
+
+    def __init__(self, *args, use_cache=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_cache = use_cache
+
+    @cached_property
+    def _approximate_count(self):
+        return approximate_count(self.object_list, self.use_cache)
+
+    @property
+    def count(self):
+        return self._approximate_count[0]
+
+    @property
+    def count_exact(self):
+        return self._approximate_count[1]
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().validate_number(number)
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if self.count_exact:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        has_next = len(object_list) > self.per_page
+        if not has_next:
+            self._approximate_count = (bottom + len(object_list), True)
+        return self._get_page(
+            object_list[: self.per_page], number, self, has_next=has_next
+        )
+
+    def _get_page(self, *args, **kwargs):
+        return ApproximatePage(*args, **kwargs)
 
 
 class CustomPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination. Views with cursor_ordering, a descending
+    (timestamp, unique field) pair such as ("-created", "-id"), also take
+    ?cursor=: the page is then taken by keyset on that pair instead, which
+    needs neither OFFSET nor COUNT(*). Querysets the filters have ordered
+    otherwise, e.g. by search rank, are always paginated by page number.
+
+    Views choose how the count is computed with count_strategy: "exact"
+    runs COUNT(*), "approximate" uses approximate_count(). Views whose
+    lists change with the user's own requests turn its cache off with
+    cache_count = False.
+    """
+
     page_size_query_param = "limit"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_ordering = getattr(view, "cursor_ordering", None)
+        self.use_cursor = (
+            self.cursor_ordering is not None
+            and self.cursor_query_param in request.query_params
+            and not queryset.query.order_by
+        )
+        if not self.use_cursor:
+            self.count_strategy = getattr(view, "count_strategy", "exact")
+            if self.count_strategy == "approximate":
+                self.django_paginator_class = partial(
+                    ApproximateCountPaginator,
+                    use_cache=getattr(view, "cache_count", True),
+                )
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        value_field, pk_field = (
+            field.lstrip("-") for field in self.cursor_ordering
+        )
+        queryset = queryset.order_by(*self.cursor_ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(**{f"{value_field}__lte": value}).exclude(
+                **{value_field: value, f"{pk_field}__gte": pk}
+            )
+
+        results = list(queryset[: page_size + 1])
+        self.next_position = None
+        if len(results) > page_size:
+            last = results[page_size - 1]
+            self.next_position = (
+                getattr(last, value_field), getattr(last, pk_field)
+            )
+        return results[:page_size]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None
+        try:
+            value, pk = b64decode(encoded.encode()).decode().split("|")
+            return datetime.fromisoformat(value), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        value, pk = position
+        encoded = b64encode(f"{value.isoformat()}|{pk}".encode()).decode()
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            response = super().get_paginated_response(data)
+            if self.count_strategy == "approximate":
+                response.data["count_exact"] = self.page.paginator.count_exact
+            return response
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
@@ -0,0 +1,97 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from recipes.cache import INGREDIENTS, TAGS
+from recipes.models import Recipe
+
+from .page_cache import get_cached_page, get_page_cache_key, set_cached_page
+from .reference import aget_reference_data, get_validators
+from .views import RecipeViewSet
+from ..async_views import AsyncReadView
+
+# Cached pages are read and written without touching the database; the
+# page cache key does read the versions, which may live there.
+cache_call = sync_to_async(thread_sensitive=False)
+
+
+class AsyncReferenceView(AsyncReadView):
+    reference_name = None
+
+    async def get(self, request, pk=None):
+        data = await aget_reference_data(self.reference_name)
+        if pk is None:
+            if not data.items:
+                raise Http404
+            payload = data.items
+        else:
+            try:
+                payload = data.by_id[int(pk)]
+            except KeyError:
+                raise Http404
+
+        etag, last_modified = get_validators(self.reference_name, data)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = self.render(payload)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class AsyncTagView(AsyncReferenceView):
+    reference_name = TAGS
+
+
+class AsyncIngredientView(AsyncReferenceView):
+    reference_name = INGREDIENTS
+
+    def use_fallback(self, request):
+        # Autocomplete (?name=) stays on the DRF view.
+        return super().use_fallback(request) or bool(request.GET.get('name'))
+
+
+class AsyncRecipeView(AsyncReadView):
+    viewset_class = RecipeViewSet
+
+    async def get(self, request, pk=None):
+        if pk is None:
+            return await self.list(request)
+
+        viewset = self.get_viewset(request, 'retrieve', pk=pk)
+        try:
+            recipe = await viewset.get_queryset().aget(pk=pk)
+        except Recipe.DoesNotExist:
+            raise Http404
+        return self.render(viewset.get_serializer(recipe).data)
+
+    async def list(self, request):
+        viewset = self.get_viewset(request, 'list')
+        cache_key = await sync_to_async(get_page_cache_key)(
+            viewset.request
+        )
+        if cache_key is not None:
+            data = await cache_call(get_cached_page)(cache_key)
+            if data is not None:
+                response = self.render(data)
+                response['X-Cache'] = 'HIT'
+                return response
+
+        # Filtering may query the database, see RecipeFilterBackend.
+        page = await sync_to_async(
+            lambda: viewset.paginate_queryset(
+                viewset.filter_queryset(viewset.get_queryset())
+            )
+        )()
+        data = viewset.get_paginated_response(
+            viewset.get_serializer(page, many=True).data
+        ).data
+
+        response = self.render(data)
+        if cache_key is not None:
+            await cache_call(set_cached_page)(cache_key, data)
+            response['X-Cache'] = 'MISS'
+        return response
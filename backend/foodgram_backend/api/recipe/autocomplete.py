@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+from django.conf import settings
+
+from recipes.cache import INGREDIENTS, get_reference_version
+from recipes.models import Ingredient
+
+from .serializers import IngredientSerializer
+
+_search_cache = OrderedDict()
+_search_cache_lock = Lock()
+
+
+def _query_ingredients(name, limit):
+    # Prefix matches go first and use ingredient_name_upper_like_idx,
+    # substring matches only fill the remaining slots.
+    ingredients = list(
+        Ingredient.objects.filter(name__istartswith=name)
+        .order_by('name')[:limit]
+    )
+    if len(ingredients) < limit:
+        ingredients += (
+            Ingredient.objects.filter(name__icontains=name)
+            .exclude(name__istartswith=name)
+            .order_by('name')[:limit - len(ingredients)]
+        )
+    return IngredientSerializer(ingredients, many=True).data
+
+
+def search_ingredients(name, limit):
+    name = name.strip()
+    key = (get_reference_version(INGREDIENTS), name.lower(), limit)
+    now = time.monotonic()
+
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+        if cached is not None and cached[0] > now:
+            _search_cache.move_to_end(key)
+            return cached[1]
+
+    result = _query_ingredients(name, limit)
+
+    with _search_cache_lock:
+        _search_cache[key] = (
+            now + settings.INGREDIENT_SEARCH_CACHE_TIMEOUT, result
+        )
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > settings.INGREDIENT_SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    return result
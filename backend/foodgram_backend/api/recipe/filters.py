@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Exists, F, OuterRef
+
+from recipes.models import Recipe, Tag
+from recipes.search import SEARCH_CONFIG, get_name_vector
+from rest_framework.filters import BaseFilterBackend
+
+User = get_user_model()
+
+
+class RecipeFilterBackend(BaseFilterBackend):
+    def filter_queryset(self, request, queryset, view):
+        query_params = request.query_params
+        current_user = request.user
+
+        for param, through in (
+            ('is_favorited', User.wish_list.through),
+            ('is_in_shopping_cart', User.shop_list.through),
+        ):
+            if not query_params.get(param):
+                continue
+            if current_user.is_anonymous:
+                return queryset.none()
+            queryset = queryset.filter(Exists(through.objects.filter(
+                user=current_user, recipe=OuterRef('pk')
+            )))
+
+        author_id = query_params.get('author')
+        if author_id:
+            queryset = queryset.filter(author_id=author_id)
+
+        tags_slug = set(query_params.getlist('tags'))
+        if tags_slug:
+            # One EXISTS per tag: the planner either probes the (recipe,
+            # tag) index for each recipe in page order, which stops early
+            # for common tags, or reads the recipes of a rare tag from
+            # recipe_tag_tag_recipe_idx. It needs the tag ids to tell
+            # common from rare.
+            tag_ids = list(
+                Tag.objects.filter(slug__in=tags_slug)
+                .values_list('pk', flat=True)
+            )
+            if len(tag_ids) < len(tags_slug):
+                return queryset.none()
+            for tag_id in tag_ids:
+                queryset = queryset.filter(Exists(
+                    Recipe.tag.through.objects.filter(
+                        recipe=OuterRef('pk'), tag_id=tag_id
+                    )
+                ))
+
+        # Full-text search over recipe_search_idx. Ranking reads every
+        # matching document, so at most RECIPE_SEARCH_CANDIDATES matches are
+        # ranked: name matches first (recipe_name_search_idx), then the
+        # newest of the others. Their ids are fetched once for both the
+        # page and the count queries; view.search_truncated tells whether
+        # more recipes match.
+        search = query_params.get('search', '').strip()
+        if search:
+            query = SearchQuery(
+                search, config=SEARCH_CONFIG, search_type='websearch'
+            )
+            limit = settings.RECIPE_SEARCH_CANDIDATES
+            candidate_ids = list(
+                queryset.alias(name_vector=get_name_vector())
+                .filter(name_vector=query)
+                .order_by('-created')
+                .values_list('pk', flat=True)[:limit + 1]
+            )
+            if len(candidate_ids) <= limit:
+                candidate_ids += (
+                    queryset.filter(search_vector=query)
+                    .exclude(pk__in=candidate_ids)
+                    .order_by('-created')
+                    .values_list('pk', flat=True)
+                    [:limit + 1 - len(candidate_ids)]
+                )
+            view.search_truncated = len(candidate_ids) > limit
+            queryset = queryset.filter(pk__in=candidate_ids[:limit]).annotate(
+                search_rank=SearchRank(F('search_vector'), query)
+            ).order_by('-search_rank', '-created')
+
+        # Served by recipe_popular_idx.
+        if query_params.get('ordering') == 'popular':
+            queryset = queryset.order_by('-favorites_count', '-created')
+
+        return queryset
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from recipes.cache import (
+    INGREDIENTS,
+    RECIPE_AUTHORS,
+    RECIPES,
+    TAGS,
+    get_versions,
+    recipe_author_version,
+    recipe_counter_version,
+    recipe_tag_version
+)
+
+HITS_KEY = 'recipe_list_cache:hits'
+MISSES_KEY = 'recipe_list_cache:misses'
+
+PERSONAL_PARAMS = ('is_favorited', 'is_in_shopping_cart')
+
+
+def _positive_int(value):
+    if value is None:
+        return None
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(value)
+    return int(value)
+
+
+def get_page_cache_key(request):
+    """
+    Cache key of the recipe list page for an anonymous request, None when
+    the page must not be cached.
+    """
+    query_params = request.query_params
+    if request.user.is_authenticated or any(
+        query_params.get(param) for param in PERSONAL_PARAMS
+    ):
+        return None
+    try:
+        page = _positive_int(query_params.get('page')) or 1
+        limit = _positive_int(query_params.get('limit'))
+        author = _positive_int(query_params.get('author') or None)
+    except ValueError:
+        return None
+    tags = sorted(set(query_params.getlist('tags')))
+    cursor = query_params.get('cursor')
+    ordering = query_params.get('ordering')
+    search = query_params.get('search', '').strip()
+
+    names = [TAGS, INGREDIENTS, RECIPE_AUTHORS]
+    if author:
+        names.append(recipe_author_version(author))
+    names += [recipe_tag_version(slug) for slug in tags]
+    if not author and not tags:
+        names.append(RECIPES)
+    if ordering == 'popular':
+        names.append(recipe_counter_version('favorites_count'))
+    versions = get_versions(names)
+
+    # Pagination links are absolute and the format changes the rendering.
+    params = json.dumps([
+        request.get_host(), request.accepted_renderer.format,
+        page, cursor, ordering, search, limit, author, tags,
+        [versions[name] for name in names],
+    ])
+    return f'recipe_list:{hashlib.sha256(params.encode()).hexdigest()}'
+
+
+def get_cached_page(cache_key):
+    data = cache.get(cache_key)
+    counter = MISSES_KEY if data is None else HITS_KEY
+    if not cache.add(counter, 1, None):
+        try:
+            cache.incr(counter)
+        except ValueError:
+            pass
+    return data
+
+
+def set_cached_page(cache_key, data):
+    cache.set(cache_key, data, settings.RECIPE_LIST_CACHE_TIMEOUT)
+
+
+def get_stats():
+    counters = cache.get_many((HITS_KEY, MISSES_KEY))
+    return counters.get(HITS_KEY, 0), counters.get(MISSES_KEY, 0)
+
+
+def reset_stats():
+    cache.delete_many((HITS_KEY, MISSES_KEY))
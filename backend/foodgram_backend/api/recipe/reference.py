@@ -0,0 +1,78 @@
+from typing import Dict, List, NamedTuple, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import quote_etag
+
+from recipes.cache import (
+    INGREDIENTS,
+    TAGS,
+    aget_reference_version,
+    get_reference_version
+)
+from recipes.models import Ingredient, Tag
+
+from .serializers import IngredientSerializer, TagSerializer
+
+REFERENCE_TABLES = {
+    TAGS: (Tag, TagSerializer),
+    INGREDIENTS: (Ingredient, IngredientSerializer),
+}
+
+
+class ReferenceData(NamedTuple):
+    version: float
+    items: List[dict]
+    by_id: Dict[int, dict]
+
+
+_local_cache = {}
+
+
+def _remember(name, version, items) -> ReferenceData:
+    data = ReferenceData(version, items, {item['id']: item for item in items})
+    _local_cache[name] = data
+    return data
+
+
+def get_reference_data(name) -> ReferenceData:
+    """
+    Serialized rows of a reference table. The payload of the current
+    version is kept in this process and in the shared default cache.
+    """
+    version = get_reference_version(name)
+    data = _local_cache.get(name)
+    if data is not None and data.version == version:
+        return data
+
+    payload_key = f'reference:{name}:{version}'
+    items = cache.get(payload_key)
+    if items is None:
+        model, serializer_class = REFERENCE_TABLES[name]
+        items = serializer_class(model.objects.order_by('id'), many=True).data
+        cache.set(payload_key, items, settings.REFERENCE_CACHE_TIMEOUT)
+
+    return _remember(name, version, items)
+
+
+async def aget_reference_data(name) -> ReferenceData:
+    """get_reference_data() for async views."""
+    version = await aget_reference_version(name)
+    data = _local_cache.get(name)
+    if data is not None and data.version == version:
+        return data
+
+    payload_key = f'reference:{name}:{version}'
+    items = await cache.aget(payload_key)
+    if items is None:
+        model, serializer_class = REFERENCE_TABLES[name]
+        rows = [row async for row in model.objects.order_by('id')]
+        items = serializer_class(rows, many=True).data
+        await cache.aset(payload_key, items, settings.REFERENCE_CACHE_TIMEOUT)
+
+    return _remember(name, version, items)
+
+
+def get_validators(name, data) -> Tuple[str, int]:
+    """ETag and Last-Modified timestamp of a reference payload."""
+    return quote_etag(f'{name}-{data.version}'), int(data.version)
@@ -1,5 +1,9 @@
+from api.media import media_url
 from api.users_auth.serializers import SafeUserSerializer
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from drf_extra_fields.fields import Base64ImageField
+from recipes.images import decode_base64_image, enqueue_variants, store_image
 from recipes.models import (
     Ingredient,
     Recipe,
@@ -50,6 +54,29 @@ class RecipeingredientsSerializer(serializers.ModelSerializer):
         return representation
 
 
+def image_variant_urls(instance):
+    return {
+        variant: media_url(name)
+        for variant, name in instance.image_variants.items()
+    }
+
+
+class RecipeImageField(serializers.Field):
+    """
+    Base64 image input decoded by recipes.images; the value is stored by
+    the serializer under its content hash.
+    """
+
+    def to_internal_value(self, data):
+        try:
+            return decode_base64_image(data)
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+    def to_representation(self, value):
+        return value.url
+
+
 class RecipeSerializer(serializers.ModelSerializer):
     tags = TagSerializer(
         source='tag',
@@ -61,12 +88,14 @@ class RecipeSerializer(serializers.ModelSerializer):
         many=False
     )
     ingredients = RecipeingredientsSerializer(
+        source='recipe_ingredients',
         many=True,
         read_only=True
     )
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
     image = Base64ImageField()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Recipe
@@ -79,28 +108,25 @@ class RecipeSerializer(serializers.ModelSerializer):
             'is_in_shopping_cart',
             'name',
             'image',
+            'image_variants',
             'text',
             'cooking_time'
         )
 
+    def get_image_variants(self, obj):
+        return image_variant_urls(obj)
+
     def get_is_favorited(self, obj):
-        return bool(
-            self.context.get('request').query_params.get('is_favorited')
-            )
+        return getattr(obj, 'is_favorited', False)
 
     def get_is_in_shopping_cart(self, obj):
-        return bool(
-            self.context.get('request').query_params.get('is_in_shopping_cart')
-            )
+        return getattr(obj, 'is_in_shopping_cart', False)
 
     def to_representation(self, instance):
         representation = super(
             RecipeSerializer, self).to_representation(instance)
 
-        representation['image'] = (
-            representation['image'][:7] +
-            '51.250.102.77' + representation['image'][15:]
-        )
+        representation['image'] = media_url(instance.image.name)
         for ingredient_index in range(len(representation['ingredients'])):
             ingredient = representation.get('ingredients')[ingredient_index]
             ingredient_value = ingredient.get('ingredient')
@@ -108,6 +134,67 @@ class RecipeSerializer(serializers.ModelSerializer):
         return representation
 
 
+class RecipeReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only RecipeSerializer for list and retrieve. Builds the same
+    representation from the prefetched objects directly, without the
+    per-field work of the nested model serializers.
+    """
+
+    def to_representation(self, instance):
+        request = self.context.get('request')
+        author = instance.author
+
+        if hasattr(author, 'is_subscribed'):
+            is_subscribed = author.is_subscribed
+        else:
+            user = request.user if request else author
+            is_subscribed = None
+            if not user.is_anonymous:
+                is_subscribed = Follow.objects.filter(
+                    followers=user, following=author
+                ).exists()
+
+        return {
+            'id': instance.id,
+            'tags': [
+                {
+                    'id': tag.id,
+                    'name': tag.name,
+                    'color': tag.color,
+                    'slug': tag.slug
+                } for tag in instance.tag.all()
+            ],
+            'author': {
+                'email': author.email,
+                'id': author.id,
+                'username': author.username,
+                'first_name': author.first_name,
+                'last_name': author.last_name,
+                'is_subscribed': is_subscribed
+            },
+            'ingredients': [
+                {
+                    'id': recipe_ingredient.ingredient.id,
+                    'name': recipe_ingredient.ingredient.name,
+                    'measurement_unit': (
+                        recipe_ingredient.ingredient.measurement_unit
+                    ),
+                    'amount': recipe_ingredient.weight
+                } for recipe_ingredient in instance.recipe_ingredients.all()
+            ],
+            'is_favorited': getattr(instance, 'is_favorited', False),
+            'is_in_shopping_cart': getattr(
+                instance, 'is_in_shopping_cart', False
+            ),
+            'name': instance.name,
+            'image': media_url(instance.image.name),
+            'image_variants': image_variant_urls(instance),
+            'text': instance.text,
+            'cooking_time': instance.cooking_time
+        }
+
+
 class CreateUpdateRecipeSerializer(serializers.ModelSerializer):
     ingredients = serializers.ListField(
         child=serializers.DictField(
@@ -116,7 +203,7 @@ class CreateUpdateRecipeSerializer(serializers.ModelSerializer):
     tags = serializers.ListField(
         child=serializers.IntegerField(min_value=0)
     )
-    image = Base64ImageField()
+    image = RecipeImageField()
 
     class Meta:
         model = Recipe
@@ -129,24 +216,57 @@ class CreateUpdateRecipeSerializer(serializers.ModelSerializer):
             'cooking_time',
         )
 
+    def validate_ingredients(self, value):
+        ingredient_ids = [item.get('id') for item in value]
+        if len(set(ingredient_ids)) != len(ingredient_ids):
+            raise serializers.ValidationError(
+                'Ингредиенты в рецепте не должны повторяться'
+            )
+        found = Ingredient.objects.in_bulk(ingredient_ids)
+        missing = [str(id) for id in ingredient_ids if id not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f'Ингредиенты не найдены: {", ".join(missing)}'
+            )
+        if any(item.get('amount') is None for item in value):
+            raise serializers.ValidationError(
+                'Укажите количество для каждого ингредиента'
+            )
+        return value
+
+    def validate_tags(self, value):
+        found = Tag.objects.in_bulk(value)
+        missing = [str(id) for id in value if id not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f'Теги не найдены: {", ".join(missing)}'
+            )
+        return value
+
+    def _add_ingredients(self, recipe, ingredients):
+        RecipeIngredients.objects.bulk_create(
+            RecipeIngredients(
+                recipe=recipe,
+                ingredient_id=value['id'],
+                weight=value['amount']
+            ) for value in ingredients
+        )
+
+    @transaction.atomic
     def create(self, validated_data):
         ingredients = validated_data.pop('ingredients')
         tag_ids = validated_data.pop('tags')
 
+        image = store_image(validated_data.pop('image'))
         recipe = Recipe.objects.create(
             **validated_data,
+            image=image,
             author=self.context['request'].user,
         )
+        enqueue_variants(recipe)
 
-        for value in ingredients:
-            recipe_ingredient = RecipeIngredients.objects.create(
-                ingredient=Ingredient.objects.get(id=value.get('id')),
-                weight=value.get('amount')
-            )
-            recipe.ingredients.add(recipe_ingredient)
-
-        for id in tag_ids:
-            recipe.tag.add(Tag.objects.get(id=id))
+        self._add_ingredients(recipe, ingredients)
+        recipe.tag.add(*tag_ids)
 
         return recipe
 
@@ -176,7 +296,7 @@ class CreateUpdateRecipeSerializer(serializers.ModelSerializer):
             'is_subscribed': is_subscribed
         }
 
-        ingredients = instance.ingredients.all()
+        ingredients = instance.recipe_ingredients.select_related('ingredient')
         ingredients_fields_to_representation = [
             {
                 'id': ingredient.ingredient.id,
@@ -186,15 +306,12 @@ class CreateUpdateRecipeSerializer(serializers.ModelSerializer):
             } for ingredient in ingredients
         ]
 
-        is_favorited = current_user.wish_list.through.objects.filter(
-            recipe__id=instance.id
-            ).exists()
+        is_favorited = current_user.wish_list.filter(id=instance.id).exists()
 
-        is_in_shopping_cart = current_user.shop_list.through.objects.filter(
-            recipe__id=instance.id
-            ).exists()
+        is_in_shopping_cart = current_user.shop_list.filter(
+            id=instance.id
+        ).exists()
 
-        image = 'http://51.250.102.77/instance.image/' + instance.image.url
         representation = {
             'id': instance.id,
             'tags': tags_fields_to_representation,
@@ -203,34 +320,39 @@ class CreateUpdateRecipeSerializer(serializers.ModelSerializer):
             'is_favorited': is_favorited,
             'is_in_shopping_cart': is_in_shopping_cart,
             'name': instance.name,
-            'image': image,
+            'image': media_url(instance.image.name),
+            'image_variants': image_variant_urls(instance),
             'test': instance.text,
             'cooking_time': instance.cooking_time
         }
         return representation
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients = validated_data.pop('ingredients')
         tag_ids = validated_data.pop('tags')
 
         instance.name = validated_data.pop('name')
         instance.text = validated_data.pop('text')
-        instance.image = validated_data.pop('image')
+        image = store_image(validated_data.pop('image'))
+        if image != instance.image.name:
+            instance.image = image
+            instance.image_variants = {}
+            enqueue_variants(instance)
         instance.cooking_time = validated_data.pop('cooking_time')
 
-        instance.ingredients.all().delete()
-        for value in ingredients:
-            recipe_ingredient, created = (
-                RecipeIngredients.objects.get_or_create(
-                    ingredient=Ingredient.objects.get(id=value.get('id')),
-                    weight=value.get('amount')
-                ))
-            instance.ingredients.add(recipe_ingredient)
-
-        instance.tag.clear()
-        for id in tag_ids:
-            instance.tag.add(Tag.objects.get(id=id))
+        instance.recipe_ingredients.all().delete()
+        self._add_ingredients(instance, ingredients)
+        instance.tag.set(tag_ids)
 
         instance.save()
 
         return instance
+
+
+class RecipeIdsSerializer(serializers.Serializer):
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
@@ -1,4 +1,10 @@
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import csv
+from datetime import timedelta
+import hashlib
+from io import BytesIO
+import threading
+from typing import Iterator, List, NamedTuple
 
 from borb.pdf import (
     Document,
@@ -7,11 +13,98 @@ from borb.pdf import (
     Paragraph,
     SingleColumnLayout,
 )
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
 import logging
 import traceback
 
-def create_file(recipes, username):
-    BASE_DIR = Path(__file__).resolve().parent.parent.parent
+from recipes.cache import bump_versions, recipe_counter_version
+from recipes.models import Recipe, RecipeIngredients, ShoppingListExport
+
+
+class ShoppingListItem(NamedTuple):
+    name: str
+    measurement_unit: str
+    amount: int
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.measurement_unit}) -- {self.amount}'
+
+
+def get_shopping_list(user) -> List[ShoppingListItem]:
+    rows = (
+        RecipeIngredients.objects
+        .filter(recipe__in=user.shop_list.through.objects.filter(
+            user=user
+        ).values('recipe'))
+        .values_list('ingredient__name', 'ingredient__measurement_unit')
+        .annotate(amount=Sum('weight'))
+        .order_by('ingredient__name', 'ingredient__measurement_unit')
+    )
+    return [ShoppingListItem(*row) for row in rows]
+
+
+def _change_user_list(statement, user_list, recipe_ids, counter):
+    through = user_list.through
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            statement.format(
+                through=quote_name(through._meta.db_table),
+                user=quote_name(through._meta.get_field('user').column),
+                recipe=quote_name(through._meta.get_field('recipe').column),
+                recipes=quote_name(Recipe._meta.db_table),
+                counter=quote_name(counter),
+            ),
+            [user_list.instance.pk, list(recipe_ids)],
+        )
+        changed = [recipe_id for recipe_id, in cursor.fetchall()]
+    # The counters order the recipe list, which is cached.
+    if changed:
+        transaction.on_commit(
+            lambda: bump_versions((recipe_counter_version(counter),))
+        )
+    return changed
+
+
+def add_to_user_list(user_list, recipe_ids, counter) -> List[int]:
+    """
+    Add recipes to a user's wish_list or shop_list and bump their counter
+    in one statement. Returns the ids that were actually added, unknown
+    and already listed recipes are skipped.
+    """
+    return _change_user_list(
+        'WITH added AS ('
+        '  INSERT INTO {through} ({user}, {recipe})'
+        '  SELECT %s, id FROM {recipes} WHERE id = ANY(%s)'
+        '  ON CONFLICT ({user}, {recipe}) DO NOTHING'
+        '  RETURNING {recipe}'
+        '), counted AS ('
+        '  UPDATE {recipes} SET {counter} = {counter} + 1'
+        '  WHERE id IN (SELECT {recipe} FROM added)'
+        ') SELECT {recipe} FROM added',
+        user_list, recipe_ids, counter
+    )
+
+
+def remove_from_user_list(user_list, recipe_ids, counter) -> List[int]:
+    """Remove recipes from a user's list, returns the removed ids."""
+    return _change_user_list(
+        'WITH removed AS ('
+        '  DELETE FROM {through} WHERE {user} = %s AND {recipe} = ANY(%s)'
+        '  RETURNING {recipe}'
+        '), counted AS ('
+        '  UPDATE {recipes} SET {counter} = {counter} - 1'
+        '  WHERE id IN (SELECT {recipe} FROM removed) AND {counter} > 0'
+        ') SELECT {recipe} FROM removed',
+        user_list, recipe_ids, counter
+    )
+
+
+def create_file(shopping_list) -> bytes:
     try:
         pdf = Document()
 
@@ -20,35 +113,111 @@ def create_file(recipes, username):
 
         layout = SingleColumnLayout(page)
 
-        ingredients = {}
+        for item in shopping_list:
+            layout.add(Paragraph(str(item)))
+
+        buffer = BytesIO()
+        PDF.dumps(buffer, pdf)
+        return buffer.getvalue()
+    except Exception:
+        logging.error(traceback.format_exc())
+        raise
+
 
-        for recipe in recipes.all():
+def get_export_digest(shopping_list, export_format) -> str:
+    digest = hashlib.sha256(export_format.encode())
+    for item in shopping_list:
+        digest.update(
+            f'{item.name}\t{item.measurement_unit}\t{item.amount}\n'.encode()
+        )
+    return digest.hexdigest()
+
+
+def get_pdf(shopping_list) -> bytes:
+    cache = caches[settings.SHOPPING_LIST_CACHE]
+    cache_key = f'shopping_list:{get_export_digest(shopping_list, "pdf")}'
+    content = cache.get(cache_key)
+    if content is None:
+        content = create_file(shopping_list)
+        cache.set(cache_key, content)
+    return content
+
+
+def iter_pdf(shopping_list) -> Iterator[bytes]:
+    return iter([get_pdf(shopping_list)])
+
+
+def iter_text(shopping_list) -> Iterator[str]:
+    for item in shopping_list:
+        yield f'{item}\n'
+
+
+class _Echo:
+    def write(self, value):
+        return value
 
-            all_recipe_ingredients = recipe.ingredients.all()
 
-            for ingredient in all_recipe_ingredients:
-                if ingredients.get(ingredient.ingredient.name):
-                    ingredients[ingredient.ingredient.name][1] += ingredient.weight
-                else:
-                    ingredients[ingredient.ingredient.name] = [
-                        ingredient.ingredient.measurement_unit,
-                        ingredient.weight
-                    ]
+def iter_csv(shopping_list) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(ShoppingListItem._fields)
+    for item in shopping_list:
+        yield writer.writerow(item)
 
-        for key, value in ingredients.items():
-            layout.add(
-                Paragraph(f'{key} ({str(value[0])}) -- {str(value[1])}')
+
+EXPORT_FORMATS = {
+    'pdf': ('application/pdf', iter_pdf),
+    'txt': ('text/plain; charset=utf-8', iter_text),
+    'csv': ('text/csv; charset=utf-8', iter_csv),
+}
+
+
+_export_executor = None
+_export_executor_lock = threading.Lock()
+
+
+def _get_export_executor():
+    global _export_executor
+    with _export_executor_lock:
+        if _export_executor is None:
+            _export_executor = ThreadPoolExecutor(
+                max_workers=settings.SHOPPING_LIST_EXPORT_WORKERS,
+                thread_name_prefix='shopping-list-export',
             )
+    return _export_executor
 
-        path_to_user_media = Path(
-            f'{BASE_DIR}/media/recipe/users/shop_list/{username}/'
+
+def run_export(export_id):
+    close_old_connections()
+    try:
+        export = ShoppingListExport.objects.select_related('user').get(
+            pk=export_id
         )
+        try:
+            content_type, render = EXPORT_FORMATS[export.export_format]
+            export.content = b''.join(
+                chunk.encode() if isinstance(chunk, str) else chunk
+                for chunk in render(get_shopping_list(export.user))
+            )
+            export.status = ShoppingListExport.DONE
+        except Exception:
+            logging.error(traceback.format_exc())
+            export.status = ShoppingListExport.FAILED
+        export.save(update_fields=('content', 'status'))
+    finally:
+        close_old_connections()
 
-        if not path_to_user_media.exists():
-            path_to_user_media.mkdir(parents=True, exist_ok=True)
 
-        with open(Path(f'{path_to_user_media}/output.pdf'), "wb") as pdf_file_handle:
-            PDF.dumps(pdf_file_handle, pdf)
-        return 'Created'
-    except Exception as e:
-        logging.error(traceback.format_exc())
+def enqueue_export(user, export_format) -> ShoppingListExport:
+    ShoppingListExport.objects.filter(
+        user=user,
+        created__lt=timezone.now() - timedelta(
+            seconds=settings.SHOPPING_LIST_EXPORT_TTL
+        ),
+    ).delete()
+    export = ShoppingListExport.objects.create(
+        user=user, export_format=export_format
+    )
+    transaction.on_commit(
+        lambda: _get_export_executor().submit(run_export, export.pk)
+    )
+    return export
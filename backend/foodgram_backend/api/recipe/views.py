@@ -1,88 +1,196 @@
-from pathlib import Path
-
-from django.http.response import HttpResponse
-from django.shortcuts import get_list_or_404, get_object_or_404
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Prefetch
+from django.http import Http404
+from django.http.response import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    quote_etag
+)
+from django.utils.http import http_date
 
-from recipes.models import Ingredient, Recipe, Tag
+from recipes.cache import INGREDIENTS, TAGS
+from recipes.models import (
+    Recipe,
+    RecipeIngredients,
+    ShoppingListExport
+)
 
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ViewSet
+from users.models import Follow
 
 
+from .autocomplete import search_ingredients
+from .filters import RecipeFilterBackend
+from .negotiation import IgnoreClientContentNegotiation
+from .page_cache import (
+    PERSONAL_PARAMS,
+    get_cached_page,
+    get_page_cache_key,
+    set_cached_page
+)
 from .permissions import RecipePermission
+from .reference import get_reference_data, get_validators
 from .serializers import (
     CreateUpdateRecipeSerializer,
-    IngredientSerializer,
-    RecipeSerializer,
-    TagSerializer
+    RecipeIdsSerializer,
+    RecipeReadSerializer,
+    RecipeSerializer
+)
+from .services import (
+    EXPORT_FORMATS,
+    add_to_user_list,
+    enqueue_export,
+    get_export_digest,
+    get_shopping_list,
+    remove_from_user_list
 )
-from .services import create_file
 from ..paginator import CustomPageNumberPagination
 
+User = get_user_model()
+
 
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
+class ReferenceViewSet(ViewSet):
+    """
+    Read-only tags and ingredients served from the reference cache with
+    ETag and Last-Modified validators.
+    """
+    reference_name = None
 
+    def get_reference_data(self):
+        return get_reference_data(self.reference_name)
 
-class TagViewSet(ViewSet):
+    def reference_response(self, data, payload):
+        etag, last_modified = get_validators(self.reference_name, data)
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = Response(payload, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
 
     def list(self, request):
-        queryset = get_list_or_404(Tag)
-        serializer = TagSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        data = self.get_reference_data()
+        if not data.items:
+            raise Http404
+        return self.reference_response(data, data.items)
 
     def retrieve(self, request, pk=None):
-        tag = get_object_or_404(Tag, pk=pk)
-        serializer = TagSerializer(tag, many=False)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        data = self.get_reference_data()
+        try:
+            item = data.by_id[int(pk)]
+        except (KeyError, TypeError, ValueError):
+            raise Http404
+        return self.reference_response(data, item)
 
 
-class IngredientViewSet(ViewSet):
+class TagViewSet(ReferenceViewSet):
+    reference_name = TAGS
 
-    def list(self, request):
-        queryset = get_list_or_404(Ingredient)
-        serializer = IngredientSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
-    def retrieve(self, request, pk=None):
-        tag = get_object_or_404(Ingredient, pk=pk)
-        serializer = IngredientSerializer(tag, many=False)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+class IngredientViewSet(ReferenceViewSet):
+    reference_name = INGREDIENTS
+
+    def list(self, request):
+        name = request.query_params.get('name')
+        if name:
+            try:
+                limit = int(request.query_params.get(
+                    'limit', settings.INGREDIENT_SEARCH_LIMIT
+                ))
+            except ValueError:
+                limit = settings.INGREDIENT_SEARCH_LIMIT
+            limit = max(1, min(limit, settings.INGREDIENT_SEARCH_MAX_LIMIT))
+            return Response(
+                search_ingredients(name, limit), status=status.HTTP_200_OK
+            )
+        return super().list(request)
 
 
 class RecipeViewSet(ModelViewSet):
     permission_classes = (RecipePermission,)
     pagination_class = CustomPageNumberPagination
+    filter_backends = (RecipeFilterBackend,)
+    count_strategy = 'approximate'
+    cursor_ordering = ('-created', '-id')
+
+    @property
+    def cache_count(self):
+        # The user's own lists change with their own requests.
+        return not any(
+            self.request.query_params.get(param) for param in PERSONAL_PARAMS
+        )
+
+    def list(self, request, *args, **kwargs):
+        cache_key = get_page_cache_key(request)
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+
+        data = get_cached_page(cache_key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_cached_page(cache_key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        # Set by RecipeFilterBackend for ?search=.
+        search_truncated = getattr(self, 'search_truncated', None)
+        if search_truncated is not None:
+            response.data['search_truncated'] = search_truncated
+        return response
 
     def get_serializer_class(self):
         if self.action in ('create', 'partial_update'):
             return CreateUpdateRecipeSerializer
+        if self.action in ('list', 'retrieve'):
+            return RecipeReadSerializer
         return RecipeSerializer
 
     def get_queryset(self):
-        req_query_params = self.request.query_params
         current_user = self.request.user
-
-        is_favorited = req_query_params.get('is_favorited')
-        is_in_shopping_cart = req_query_params.get('is_in_shopping_cart')
-        author_id = req_query_params.get('author')
-        tags_slug = req_query_params.getlist('tags')
-
         all_recipes = Recipe.objects.all()
 
-        if is_favorited:
-            all_recipes = all_recipes & current_user.wish_list.all()
-        if is_in_shopping_cart:
-            all_recipes = all_recipes & current_user.shop_list.all()
-        if author_id:
-            all_recipes = all_recipes.filter(author__id=author_id)
-        if tags_slug:
-            for slug in tags_slug:
-                all_recipes = all_recipes.filter(tag__slug=slug)
+        authors = User.objects.all()
+        if current_user.is_authenticated:
+            all_recipes = all_recipes.annotate(
+                is_favorited=Exists(User.wish_list.through.objects.filter(
+                    user=current_user, recipe=OuterRef('pk')
+                )),
+                is_in_shopping_cart=Exists(
+                    User.shop_list.through.objects.filter(
+                        user=current_user, recipe=OuterRef('pk')
+                    )
+                ),
+            )
+            authors = authors.annotate(
+                is_subscribed=Exists(Follow.objects.filter(
+                    followers=current_user, following=OuterRef('pk')
+                ))
+            )
 
-        return all_recipes
+        return all_recipes.prefetch_related(
+            Prefetch('author', queryset=authors),
+            'tag',
+            Prefetch(
+                'recipe_ingredients',
+                queryset=RecipeIngredients.objects.select_related('ingredient')
+            ),
+        )
 
     @action(
         detail=False,
@@ -91,26 +199,28 @@ class RecipeViewSet(ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def favorite(self, request, recipe_pk=None):
-        if request.method == 'POST':
-            current_user = request.user
-            recipe = get_object_or_404(Recipe, id=recipe_pk)
+        current_user = request.user
+        recipe_id = self._get_recipe_id(recipe_pk)
 
-            current_user.wish_list.add(recipe)
+        if request.method == 'POST':
+            if not add_to_user_list(
+                current_user.wish_list, [recipe_id], 'favorites_count'
+            ):
+                get_object_or_404(Recipe, id=recipe_id)
             return Response(
                 'Рецепт успешно добавлен в избранное',
                 status=status.HTTP_200_OK)
 
         elif request.method == 'DELETE':
-            current_user = request.user
-            recipe = get_object_or_404(Recipe, id=recipe_pk)
-
-            if recipe in current_user.wish_list.all():
-                current_user.wish_list.remove(recipe)
+            if remove_from_user_list(
+                current_user.wish_list, [recipe_id], 'favorites_count'
+            ):
                 return Response(
                     'Рецепт успешно удалён из избранного',
                     status=status.HTTP_204_NO_CONTENT
                 )
 
+            get_object_or_404(Recipe, id=recipe_id)
             return Response(
                 'Рецепта нет в избранном',
                 status=status.HTTP_400_BAD_REQUEST
@@ -118,31 +228,118 @@ class RecipeViewSet(ModelViewSet):
 
     @action(
         detail=False,
-        methods=['get'],
+        methods=['post', 'delete'],
+        url_path='favorite',
+        permission_classes=[IsAuthenticated],
+    )
+    def favorite_batch(self, request):
+        return self._change_user_list(
+            request, request.user.wish_list, 'favorites_count'
+        )
+
+    @action(
+        detail=False,
+        methods=['post', 'delete'],
+        url_path='shopping_cart',
+        permission_classes=[IsAuthenticated],
+    )
+    def shopping_cart_batch(self, request):
+        return self._change_user_list(
+            request, request.user.shop_list, 'in_carts_count'
+        )
+
+    def _get_recipe_id(self, recipe_pk):
+        try:
+            return int(recipe_pk)
+        except ValueError:
+            raise Http404
+
+    def _change_user_list(self, request, user_list, counter):
+        serializer = RecipeIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = serializer.validated_data['recipes']
+
+        if request.method == 'POST':
+            added = add_to_user_list(user_list, recipe_ids, counter)
+            return Response({'added': added}, status=status.HTTP_200_OK)
+
+        removed = remove_from_user_list(user_list, recipe_ids, counter)
+        return Response({'removed': removed}, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=['get', 'post'],
         url_path='download_shopping_cart',
         permission_classes=[IsAuthenticated],
+        content_negotiation_class=IgnoreClientContentNegotiation,
     )
     def download_shopping_cart(self, request):
-        current_user = request.user
-        user_username = current_user.username
-        current_user_shop_list = current_user.shop_list
-        try:
-            create_file(current_user_shop_list, request.user.username)
+        export_format = request.query_params.get('format', 'pdf')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                'Неподдерживаемый формат списка покупок',
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        content_type, render = EXPORT_FORMATS[export_format]
 
-            path_to_file = Path(
-                f'{BASE_DIR}/media/recipe/users/'
-                f'shop_list/{user_username}/output.pdf'
+        run_async = request.query_params.get('async', '').lower() in (
+            '1', 'true', 'yes'
+        )
+        if request.method == 'POST' and run_async:
+            export = enqueue_export(request.user, export_format)
+            return Response(
+                {'id': export.id, 'status': export.status},
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': f'{request.path}{export.id}/'}
             )
-            wish_list_pdf = open(path_to_file, mode='rb')
 
-            return HttpResponse(wish_list_pdf, content_type='application/pdf')
+        shopping_list = get_shopping_list(request.user)
+        etag = quote_etag(get_export_digest(shopping_list, export_format))
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
 
+        try:
+            content = render(shopping_list)
         except Exception:
             return Response(
                 'Something went wrong',
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="shopping_list.{export_format}"'
+        )
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path=r'download_shopping_cart/(?P<export_pk>\d+)',
+        permission_classes=[IsAuthenticated],
+    )
+    def shopping_cart_export(self, request, export_pk=None):
+        export = get_object_or_404(
+            ShoppingListExport, id=export_pk, user=request.user
+        )
+        if export.status != ShoppingListExport.DONE:
+            return Response(
+                {'id': export.id, 'status': export.status},
+                status=status.HTTP_200_OK
+            )
+
+        content_type = EXPORT_FORMATS[export.export_format][0]
+        response = HttpResponse(
+            bytes(export.content), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="shopping_list.{export.export_format}"'
+        )
+        return response
+
     @action(
         detail=False,
         methods=['post', 'delete'],
@@ -150,26 +347,28 @@ class RecipeViewSet(ModelViewSet):
         permission_classes=[IsAuthenticated],
     )
     def shopping_cart(self, request, recipe_pk=None):
-        if request.method == 'POST':
-            current_user = request.user
-            recipe = get_object_or_404(Recipe, id=recipe_pk)
+        current_user = request.user
+        recipe_id = self._get_recipe_id(recipe_pk)
 
-            current_user.shop_list.add(recipe)
+        if request.method == 'POST':
+            if not add_to_user_list(
+                current_user.shop_list, [recipe_id], 'in_carts_count'
+            ):
+                get_object_or_404(Recipe, id=recipe_id)
             return Response(
                 'Рецепт успешно добавлен в список покупок',
                 status=status.HTTP_200_OK)
 
         elif request.method == 'DELETE':
-            current_user = request.user
-            recipe = get_object_or_404(Recipe, id=recipe_pk)
-
-            if recipe in current_user.shop_list.all():
-                current_user.shop_list.remove(recipe)
+            if remove_from_user_list(
+                current_user.shop_list, [recipe_id], 'in_carts_count'
+            ):
                 return Response(
                     'Рецепт успешно удалён из список покупок',
                     status=status.HTTP_204_NO_CONTENT
                 )
 
+            get_object_or_404(Recipe, id=recipe_id)
             return Response(
                 'Рецепта нет в список покупок',
                 status=status.HTTP_400_BAD_REQUEST
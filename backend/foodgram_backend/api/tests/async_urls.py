@@ -0,0 +1,8 @@
+"""The API as served with ASYNC_READ_VIEWS = True."""
+from django.urls import include, path
+
+from .. import urls
+
+urlpatterns = [
+    path('api/', include(urls.async_urlpatterns + urls.urlpatterns)),
+]
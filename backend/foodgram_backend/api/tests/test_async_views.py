@@ -0,0 +1,126 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, TestCase, override_settings
+
+from recipes.models import Ingredient, Tag
+from users.models import Follow
+
+from .utils import (
+    api_client,
+    clear_caches,
+    create_ingredient,
+    create_recipe,
+    create_tag,
+    create_user
+)
+from ..urls import async_urlpatterns
+
+ASYNC_URLCONF = 'api.tests.async_urls'
+
+
+class AsyncViewParityTests(TestCase):
+    """The async read views answer exactly like the DRF views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        authors = [create_user() for _ in range(3)]
+        for author in authors[:2]:
+            Follow.objects.create(followers=cls.user, following=author)
+        cls.tags = [create_tag(), create_tag()]
+        ingredients = [
+            create_ingredient(name=name)
+            for name in ('морковь', 'молоко', 'мука')
+        ]
+        for number in range(6):
+            cls.recipe = create_recipe(
+                authors[number % 3],
+                tags=cls.tags[:number % 2 + 1],
+                ingredients=[(ingredient, 50) for ingredient in ingredients],
+            )
+        cls.user.wish_list.add(cls.recipe)
+
+    def sync_get(self, path, user=None, **headers):
+        return api_client(user).get(path, **headers)
+
+    def async_get(self, path, user=None, **headers):
+        if user is not None:
+            token = user.auth_token.key
+            headers.setdefault('HTTP_AUTHORIZATION', f'Token {token}')
+        # AsyncClient takes the header names themselves.
+        headers = {
+            name[5:].replace('_', '-').lower(): value
+            for name, value in headers.items()
+        }
+
+        async def get():
+            return await AsyncClient().get(path, **headers)
+
+        with override_settings(ROOT_URLCONF=ASYNC_URLCONF):
+            return async_to_sync(get)()
+
+    def assert_same(self, path, user=None, **headers):
+        # Both requests miss the recipe page cache.
+        clear_caches()
+        expected = self.sync_get(path, user, **headers)
+        clear_caches()
+        response = self.async_get(path, user, **headers)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(
+            response.get('Content-Type'), expected.get('Content-Type')
+        )
+        return response
+
+    def test_routes_are_async(self):
+        self.assertEqual(len(async_urlpatterns), 7)
+        for pattern in async_urlpatterns:
+            self.assertTrue(pattern.callback.view_class.view_is_async)
+
+    def test_reference_data(self):
+        tag = Tag.objects.first()
+        ingredient = Ingredient.objects.first()
+        for path in (
+            '/api/tags/', f'/api/tags/{tag.id}/', '/api/tags/0/',
+            '/api/ingredients/', f'/api/ingredients/{ingredient.id}/',
+            '/api/ingredients/?name=мо',
+        ):
+            with self.subTest(path=path):
+                self.assert_same(path)
+
+    def test_reference_validators(self):
+        response = self.assert_same('/api/tags/')
+        self.assertEqual(
+            self.async_get(
+                '/api/tags/', HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code,
+            304
+        )
+
+    def test_recipes(self):
+        slug = self.tags[1].slug
+        for user in (None, self.user):
+            for path in (
+                '/api/recipes/?limit=4',
+                '/api/recipes/?limit=4&page=2',
+                f'/api/recipes/?tags={slug}&limit=2',
+                '/api/recipes/?is_favorited=1',
+                '/api/recipes/?cursor=&limit=2',
+                f'/api/recipes/{self.recipe.id}/',
+                '/api/recipes/0/',
+            ):
+                with self.subTest(path=path, user=user):
+                    self.assert_same(path, user)
+
+    def test_subscriptions(self):
+        for path in (
+            '/api/users/subscriptions/',
+            '/api/users/subscriptions/?limit=1&recipes_limit=1',
+            '/api/users/subscriptions/?cursor=&limit=1',
+        ):
+            with self.subTest(path=path):
+                self.assert_same(path, self.user)
+
+    def test_invalid_token(self):
+        self.assert_same(
+            '/api/recipes/', HTTP_AUTHORIZATION='Token invalid'
+        )
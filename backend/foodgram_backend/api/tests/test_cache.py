@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from recipes.cache import TAGS, bump_versions, check_version_cache
+
+from .utils import api_client, clear_caches, create_tag
+
+
+class VersionCacheTests(TestCase):
+    def setUp(self):
+        clear_caches()
+
+    def test_versions_are_kept_in_the_database(self):
+        create_tag()
+        etag = api_client().get('/api/tags/')['ETag']
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT count(*) FROM '
+                + settings.CACHES[settings.VERSION_CACHE]['LOCATION']
+            )
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+        # Another worker edits a tag: only the shared version changes.
+        with override_settings(CACHES={
+            **settings.CACHES,
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'other-worker',
+            },
+        }):
+            bump_versions((TAGS,))
+        self.assertNotEqual(api_client().get('/api/tags/')['ETag'], etag)
+
+    def test_local_version_cache_is_reported(self):
+        self.assertEqual(check_version_cache(None), [])
+        with override_settings(CACHES={
+            **settings.CACHES,
+            settings.VERSION_CACHE: {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+        }):
+            self.assertEqual(
+                [error.id for error in check_version_cache(None)],
+                ['recipes.W001']
+            )
+        caches[settings.VERSION_CACHE].clear()
@@ -0,0 +1,153 @@
+import threading
+import time
+
+from django.db import connection
+from django.test import TestCase
+import psycopg2
+
+from foodgram_backend.postgresql_pool import base as pool_backend
+from foodgram_backend.postgresql_pool.base import (
+    ConnectionPool,
+    get_pool_stats
+)
+
+from .utils import api_client, create_user
+
+
+class ConnectionPoolTests(TestCase):
+    def create_pool(self, **kwargs):
+        params = connection.get_connection_params()
+        opened = []
+
+        def connect():
+            conn = psycopg2.connect(**params)
+            opened.append(conn)
+            return conn
+
+        # Open connections would keep the test database from being dropped.
+        self.addCleanup(lambda: [conn.close() for conn in opened])
+        options = {
+            'min_size': 1, 'max_size': 2, 'timeout': 1, 'health_checks': True
+        }
+        options.update(kwargs)
+        return ConnectionPool(connect, **options)
+
+    def test_checkout_and_return(self):
+        pool = self.create_pool()
+        self.assertEqual(pool.get_stats()['idle'], 1)
+
+        conn = pool.getconn()
+        stats = pool.get_stats()
+        self.assertEqual((stats['in_use'], stats['idle']), (1, 0))
+
+        pool.putconn(conn)
+        stats = pool.get_stats()
+        self.assertEqual((stats['in_use'], stats['idle']), (0, 1))
+        self.assertIs(pool.getconn(), conn)
+        self.assertEqual(pool.get_stats()['checkouts'], 2)
+
+    def test_open_transaction_is_rolled_back(self):
+        pool = self.create_pool()
+        conn = pool.getconn()
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertEqual(
+            conn.info.transaction_status,
+            psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+        pool.putconn(conn)
+        self.assertEqual(
+            conn.info.transaction_status,
+            psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        )
+
+    def test_broken_connections_are_discarded(self):
+        pool = self.create_pool()
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.close()
+
+        fresh = pool.getconn()
+        self.assertIsNot(fresh, conn)
+        self.assertFalse(fresh.closed)
+        self.assertEqual(pool.get_stats()['discarded'], 1)
+
+        pool.putconn(fresh, close=True)
+        self.assertTrue(fresh.closed)
+        self.assertEqual(pool.get_stats()['idle'], 0)
+
+    def test_timeout(self):
+        pool = self.create_pool(max_size=1, timeout=0.1)
+        conn = pool.getconn()
+        started = time.monotonic()
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.getconn()
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        stats = pool.get_stats()
+        self.assertEqual((stats['waits'], stats['timeouts']), (1, 1))
+
+        pool.putconn(conn)
+        self.assertIs(pool.getconn(), conn)
+
+    def test_waiter_gets_returned_connection(self):
+        pool = self.create_pool(max_size=1, timeout=5)
+        conn = pool.getconn()
+        received = []
+        waiter = threading.Thread(
+            target=lambda: received.append(pool.getconn())
+        )
+        waiter.start()
+        while not pool.get_stats()['waits']:
+            time.sleep(0.01)
+        pool.putconn(conn)
+        waiter.join()
+
+        self.assertEqual(received, [conn])
+        self.assertEqual(pool.get_stats()['timeouts'], 0)
+
+
+class PooledBackendTests(TestCase):
+    def setUp(self):
+        # A second wrapper of the test database, under the same alias as
+        # the connection_created handlers look it up.
+        settings_dict = {
+            **connection.settings_dict,
+            'ENGINE': 'foodgram_backend.postgresql_pool',
+            'CONN_MAX_AGE': 0,
+            'POOL': {'MIN_SIZE': 0, 'MAX_SIZE': 2, 'TIMEOUT': 1},
+        }
+        self.alias = connection.alias
+        self.wrapper = pool_backend.DatabaseWrapper(settings_dict, self.alias)
+        self.addCleanup(self.close_pool)
+        self.addCleanup(self.wrapper.close)
+
+    def close_pool(self):
+        pool = pool_backend._pools.pop(self.alias, None)
+        if pool is not None:
+            for conn in pool._idle:
+                conn.close()
+
+    def test_connection_returns_to_pool_on_close(self):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        raw = self.wrapper.connection
+        self.assertEqual(get_pool_stats()[self.alias]['in_use'], 1)
+
+        self.wrapper.close()
+        stats = get_pool_stats()[self.alias]
+        self.assertEqual((stats['in_use'], stats['idle']), (0, 1))
+        self.assertFalse(raw.closed)
+
+        with self.wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIs(self.wrapper.connection, raw)
+
+
+class DatabasePoolStatsTests(TestCase):
+    def test_admin_only(self):
+        response = api_client(create_user()).get('/api/db_pool/')
+        self.assertEqual(response.status_code, 403)
+
+        admin = create_user(is_staff=True)
+        response = api_client(admin).get('/api/db_pool/')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .utils import (
+    api_client,
+    clear_caches,
+    create_recipe,
+    create_tag,
+    create_user
+)
+
+
+class RecipeFilterIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [create_user() for _ in range(3)]
+        cls.tags = [create_tag() for _ in range(3)]
+        for number in range(30):
+            create_recipe(
+                cls.authors[number % 3], tags=cls.tags[:number % 3 + 1]
+            )
+
+    def setUp(self):
+        clear_caches()
+
+    def explain_page_query(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client().get(
+                '/api/recipes/', {'limit': 5, **params}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['results'])
+        page_query = next(
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT "recipes_recipe"."id"')
+        )
+        # The test tables are small enough to be scanned whole.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + page_query)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def test_tags(self):
+        for tags in (self.tags[:1], self.tags[:2], self.tags):
+            with self.subTest(tags=len(tags)):
+                plan = self.explain_page_query(
+                    {'tags': [tag.slug for tag in tags]}
+                )
+                self.assertIn('recipe_tag_tag_recipe_idx', plan)
+
+    def test_author(self):
+        plan = self.explain_page_query({'author': self.authors[0].id})
+        self.assertIn('recipe_author_created_idx', plan)
@@ -0,0 +1,88 @@
+import base64
+import hashlib
+from io import BytesIO
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from recipes import images
+
+from .utils import encode_image
+
+
+class DecodeBase64ImageTests(SimpleTestCase):
+    def test_line_wrapped(self):
+        # Noise does not compress, so the upload spans several chunks.
+        content = BytesIO()
+        Image.frombytes('RGB', (200, 200), os.urandom(200 * 200 * 3)).save(
+            content, 'PNG'
+        )
+        content = content.getvalue()
+        data = base64.encodebytes(content).decode()
+        self.assertGreater(len(data), 2 * images.DECODE_CHUNK)
+
+        for upload in (data, 'data:image/png;base64,' + data):
+            decoded = images.decode_base64_image(upload)
+            self.assertEqual(decoded.file.read(), content)
+            self.assertEqual(
+                decoded.digest, hashlib.sha256(content).hexdigest()
+            )
+
+    def test_invalid_characters(self):
+        with self.assertRaises(ValidationError):
+            images.decode_base64_image('*' + encode_image('red')[1:])
+
+
+class ImageStorageTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media_root)
+            for root, _, names in os.walk(self.media_root)
+            for name in names
+        )
+
+    def test_same_content_is_stored_once(self):
+        first = images.store_image(images.decode_base64_image(
+            encode_image('red')
+        ))
+        second = images.store_image(images.decode_base64_image(
+            'data:image/png;base64,' + encode_image('red')
+        ))
+        self.assertEqual(first, second)
+        self.assertEqual(self.stored_files(), [first])
+
+    def test_concurrent_writers_keep_one_file(self):
+        name = images.store_image(images.decode_base64_image(
+            encode_image('blue')
+        ))
+        variants = images.build_variants(name)
+        files = self.stored_files()
+
+        # Another worker stored the files between the check and the save.
+        storage = mock.Mock(wraps=default_storage)
+        storage.exists.return_value = False
+        with mock.patch.object(images, 'default_storage', storage):
+            self.assertEqual(
+                images.store_image(images.decode_base64_image(
+                    encode_image('blue')
+                )),
+                name
+            )
+            self.assertEqual(images.build_variants(name), variants)
+        self.assertEqual(self.stored_files(), files)
+        self.assertEqual(len(files), 1 + len(variants))
+        self.assertEqual(storage.delete.call_count, len(files))
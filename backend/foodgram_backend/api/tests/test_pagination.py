@@ -0,0 +1,135 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from recipes.models import Recipe
+from users.models import Follow
+
+from .utils import api_client, clear_caches, create_recipe, create_user
+
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        authors = [create_user() for _ in range(5)]
+        for author in authors:
+            Follow.objects.create(followers=cls.user, following=author)
+        for number in range(7):
+            create_recipe(authors[number % 5])
+        # Ties on created are broken by id.
+        Recipe.objects.filter(pk__in=Recipe.objects.values('pk')[:4]).update(
+            created=timezone.now()
+        )
+
+    def setUp(self):
+        clear_caches()
+
+    def follow_cursor(self, client, path):
+        ids = []
+        url = f'{path}?cursor=&limit=3'
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_recipe_pages(self):
+        ids = self.follow_cursor(api_client(), '/api/recipes/')
+        self.assertEqual(
+            ids,
+            list(Recipe.objects.order_by('-created', '-id')
+                 .values_list('id', flat=True))
+        )
+
+    def test_subscription_pages(self):
+        follows = self.follow_cursor(
+            api_client(self.user), '/api/users/subscriptions/'
+        )
+        self.assertEqual(len(follows), 5)
+        self.assertEqual(len(set(follows)), 5)
+
+    def test_invalid_cursor(self):
+        response = api_client().get('/api/recipes/', {'cursor': 'broken'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_ignored_without_cursor_ordering(self):
+        response = api_client().get('/api/users/', {'cursor': ''})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('count', response.data)
+
+    def test_popular_ordering_keeps_page_numbers(self):
+        first = Recipe.objects.order_by('created').first()
+        Recipe.objects.filter(pk=first.pk).update(favorites_count=5)
+        response = api_client().get(
+            '/api/recipes/', {'cursor': '', 'ordering': 'popular'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('count', response.data)
+        self.assertEqual(response.data['results'][0]['id'], first.pk)
+
+
+class ApproximateCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.author = create_user()
+        cls.recipes = [create_recipe(cls.author) for _ in range(3)]
+
+    def setUp(self):
+        clear_caches()
+        self.client = api_client(self.user)
+
+    def test_cached_count_is_not_exact(self):
+        params = {'author': self.author.id, 'limit': 1}
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.data['count'], 3)
+        self.assertTrue(response.data['count_exact'])
+
+        create_recipe(self.author)
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.data['count'], 3)
+        self.assertFalse(response.data['count_exact'])
+        self.assertIsNotNone(response.data['next'])
+
+        # The last page is reached past the cached count and counted.
+        response = self.client.get('/api/recipes/', {**params, 'page': 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 4)
+        self.assertTrue(response.data['count_exact'])
+        self.assertIsNone(response.data['next'])
+
+    def test_favorites_are_counted_per_request(self):
+        params = {'is_favorited': 1}
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.data['count'], 0)
+
+        recipe = self.recipes[0]
+        self.client.post(f'/api/recipes/{recipe.id}/favorite/')
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.data['count'], 1)
+        self.assertTrue(response.data['count_exact'])
+        self.assertEqual(response.data['results'][0]['id'], recipe.id)
+
+    def test_shopping_cart_pages_follow_changes(self):
+        params = {'is_in_shopping_cart': 1, 'limit': 1}
+        for recipe in self.recipes:
+            self.client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.data['count'], 3)
+
+        recipe = create_recipe(self.author)
+        self.client.post(f'/api/recipes/{recipe.id}/shopping_cart/')
+        response = self.client.get('/api/recipes/', {**params, 'page': 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 4)
+
+    def test_subscriptions_are_counted_per_request(self):
+        response = self.client.get('/api/users/subscriptions/')
+        self.assertEqual(response.status_code, 404)
+
+        self.client.post(f'/api/users/{self.author.id}/subscribe/')
+        response = self.client.get('/api/users/subscriptions/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
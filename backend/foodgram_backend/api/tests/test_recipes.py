@@ -0,0 +1,202 @@
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from recipes.models import Recipe
+from users.models import Follow
+
+from .utils import (
+    api_client,
+    clear_caches,
+    create_ingredient,
+    create_recipe,
+    create_tag,
+    create_user,
+    encode_image
+)
+
+
+class RecipeQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        authors = [create_user() for _ in range(3)]
+        Follow.objects.create(followers=cls.user, following=authors[0])
+        tags = [create_tag() for _ in range(2)]
+        ingredients = [create_ingredient() for _ in range(3)]
+        for number in range(12):
+            recipe = create_recipe(
+                authors[number % 3],
+                tags=tags[:number % 2 + 1],
+                ingredients=[(ingredient, 10) for ingredient in ingredients],
+            )
+        cls.recipe = recipe
+        cls.user.wish_list.add(recipe)
+
+    def setUp(self):
+        clear_caches()
+        api_client().get('/api/recipes/')
+        clear_caches(versions=False)
+
+    # Planner estimate, count of the small table, page, authors, tags and
+    # ingredients, plus the page cache versions for anonymous requests and
+    # the token for authenticated ones.
+    def test_list_anonymous(self):
+        client = api_client()
+        with self.assertNumQueries(7):
+            response = client.get('/api/recipes/', {'limit': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_list_authenticated(self):
+        client = api_client(self.user)
+        with self.assertNumQueries(7):
+            response = client.get('/api/recipes/', {'limit': 10})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(len(results), 10)
+        self.assertTrue(results[0]['is_favorited'])
+
+    def test_retrieve_anonymous(self):
+        client = api_client()
+        with self.assertNumQueries(4):
+            response = client.get(f'/api/recipes/{self.recipe.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['ingredients']), 3)
+
+    def test_retrieve_authenticated(self):
+        client = api_client(self.user)
+        with self.assertNumQueries(5):
+            response = client.get(f'/api/recipes/{self.recipe.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_favorited'])
+        self.assertFalse(response.data['is_in_shopping_cart'])
+
+
+class RecipePageSizeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        authors = [create_user() for _ in range(10)]
+        for author in authors:
+            Follow.objects.create(followers=cls.user, following=author)
+        tags = [create_tag() for _ in range(3)]
+        ingredients = [create_ingredient() for _ in range(5)]
+        for number in range(100):
+            create_recipe(
+                authors[number % 10],
+                tags=tags,
+                ingredients=[(ingredient, 10) for ingredient in ingredients],
+            )
+
+    def setUp(self):
+        clear_caches()
+        api_client().get('/api/recipes/')
+
+    def assert_queries_per_limit(self, client, queries):
+        for limit in (1, 10, 100):
+            with self.subTest(limit=limit):
+                clear_caches(versions=False)
+                with self.assertNumQueries(queries):
+                    response = client.get('/api/recipes/', {'limit': limit})
+                self.assertEqual(len(response.data['results']), limit)
+
+    def test_anonymous(self):
+        self.assert_queries_per_limit(api_client(), 7)
+
+    def test_authenticated(self):
+        self.assert_queries_per_limit(api_client(self.user), 7)
+
+
+class RecipePageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        author = create_user()
+        cls.recipes = [create_recipe(author) for _ in range(3)]
+
+    def setUp(self):
+        clear_caches()
+
+    def test_popular_page_follows_favorites(self):
+        anonymous = api_client()
+        params = {'ordering': 'popular'}
+        response = anonymous.get('/api/recipes/', params)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = anonymous.get('/api/recipes/', params)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        oldest = self.recipes[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = api_client(self.user).post(
+                f'/api/recipes/{oldest.id}/favorite/'
+            )
+        self.assertEqual(response.status_code, 200)
+
+        response = anonymous.get('/api/recipes/', params)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['id'], oldest.id)
+
+
+class RecipeWriteQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.tags = [create_tag() for _ in range(3)]
+        cls.ingredients = [create_ingredient() for _ in range(30)]
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = api_client(self.user)
+
+    def payload(self, ingredients, name):
+        return {
+            'ingredients': [
+                {'id': ingredient.id, 'amount': 10}
+                for ingredient in self.ingredients[:ingredients]
+            ],
+            'tags': [tag.id for tag in self.tags],
+            'image': encode_image('green'),
+            'name': name,
+            'text': 'Описание',
+            'cooking_time': 15,
+        }
+
+    # The number of queries does not depend on the number of ingredients.
+    def test_create(self):
+        for ingredients in (1, 30):
+            with self.subTest(ingredients=ingredients):
+                with self.assertNumQueries(17):
+                    response = self.client.post(
+                        '/api/recipes/',
+                        self.payload(ingredients, f'Рецепт {ingredients}'),
+                        format='json',
+                    )
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(
+                    len(response.data['ingredients']), ingredients
+                )
+
+    def test_update(self):
+        for ingredients in (1, 30):
+            recipe = create_recipe(
+                self.user, tags=self.tags[:1],
+                ingredients=[(self.ingredients[0], 5)],
+            )
+            with self.subTest(ingredients=ingredients):
+                with self.assertNumQueries(23):
+                    response = self.client.patch(
+                        f'/api/recipes/{recipe.id}/',
+                        self.payload(ingredients, f'Рецепт {ingredients}'),
+                        format='json',
+                    )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    Recipe.objects.get(pk=recipe.pk).ingredients.count(),
+                    ingredients
+                )
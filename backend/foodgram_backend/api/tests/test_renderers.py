@@ -0,0 +1,64 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+import uuid
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from ..renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assert_same_as_stock(self, data):
+        rendered = FastJSONRenderer().render(data)
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        return rendered
+
+    def test_cyrillic_is_not_escaped(self):
+        rendered = self.assert_same_as_stock({'name': 'Борщ', 'unit': 'г'})
+        self.assertIn('Борщ'.encode(), rendered)
+
+    def test_line_separators_stay_escaped(self):
+        rendered = self.assert_same_as_stock({'text': 'a\u2028b\u2029c'})
+        self.assertIn(b'\\u2028', rendered)
+        self.assertIn(b'\\u2029', rendered)
+
+    def test_datetime_decimal_and_lazy_strings(self):
+        self.assert_same_as_stock({
+            'created': datetime(2023, 1, 2, 3, 4, 5, 678000, timezone.utc),
+            'naive': datetime(2023, 1, 2, 3, 4, 5),
+            'day': date(2023, 1, 2),
+            'amount': Decimal('1.50'),
+            'id': uuid.UUID(int=1),
+            'label': gettext_lazy('Имя'),
+        })
+
+    def test_falls_back_for_large_integers_and_indent(self):
+        self.assert_same_as_stock({'big': 2 ** 70})
+        data = {'name': 'Борщ', 'items': [1, 2]}
+        self.assertEqual(
+            FastJSONRenderer().render(
+                data, renderer_context={'indent': 2}
+            ),
+            JSONRenderer().render(data, renderer_context={'indent': 2})
+        )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body):
+        return FastJSONParser().parse(BytesIO(body), parser_context={})
+
+    def test_parses_utf8(self):
+        self.assertEqual(
+            self.parse('{"name": "Борщ"}'.encode()), {'name': 'Борщ'}
+        )
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            self.parse(b'{"name": ')
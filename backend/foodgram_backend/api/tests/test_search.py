@@ -0,0 +1,178 @@
+from django.test import TestCase, override_settings
+
+from recipes.models import Ingredient, Recipe
+
+from .utils import (
+    api_client,
+    clear_caches,
+    create_ingredient,
+    create_recipe,
+    create_tag,
+    create_user
+)
+
+
+class RecipeSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user()
+        other = create_user()
+        cls.tag = create_tag()
+        potato = create_ingredient(name='Картофель')
+        cls.butter = create_ingredient(name='Сливочное масло')
+        onion = create_ingredient(name='Лук')
+        # The search vectors are built once the recipes are committed.
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.in_text = create_recipe(
+                cls.author, name='Запеканка', text='Много картофеля',
+                ingredients=[(onion, 1)],
+            )
+            cls.in_ingredients = create_recipe(
+                other, name='Пюре', tags=[cls.tag],
+                ingredients=[(potato, 500), (cls.butter, 50)],
+            )
+            cls.in_name = create_recipe(
+                cls.author, name='Картофель по-деревенски',
+                ingredients=[(potato, 1000)],
+            )
+            cls.unrelated = create_recipe(
+                other, name='Борщ', text='Свёкла и капуста',
+                ingredients=[(onion, 1)],
+            )
+
+    def setUp(self):
+        clear_caches()
+        self.client = api_client()
+
+    def search(self, query, **params):
+        response = self.client.get(
+            '/api/recipes/', {'search': query, 'limit': 10, **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        return [recipe['id'] for recipe in response.data['results']]
+
+    def test_ranked_by_field_weight(self):
+        self.assertEqual(
+            self.search('картофель'),
+            [self.in_name.id, self.in_ingredients.id, self.in_text.id]
+        )
+
+    def test_russian_stemming(self):
+        self.assertEqual(self.search('борща'), [self.unrelated.id])
+        self.assertIn(self.in_text.id, self.search('картофелем'))
+
+    def test_websearch_syntax(self):
+        self.assertEqual(
+            self.search('картофель -масло'),
+            [self.in_name.id, self.in_text.id]
+        )
+        self.assertEqual(
+            self.search('"свёкла и капуста"'), [self.unrelated.id]
+        )
+        self.assertEqual(self.search('ананас'), [])
+
+    def test_combined_with_filters(self):
+        self.assertEqual(
+            self.search('картофель', tags=self.tag.slug),
+            [self.in_ingredients.id]
+        )
+        self.assertEqual(
+            self.search('картофель', author=self.author.id),
+            [self.in_name.id, self.in_text.id]
+        )
+
+    def test_not_truncated(self):
+        response = self.client.get(
+            '/api/recipes/', {'search': 'картофель', 'limit': 10}
+        )
+        self.assertEqual(response.data['count'], 3)
+        self.assertIs(response.data['search_truncated'], False)
+        self.assertNotIn(
+            'search_truncated',
+            self.client.get('/api/recipes/', {'limit': 10}).data
+        )
+
+    @override_settings(RECIPE_SEARCH_CANDIDATES=2)
+    def test_name_matches_are_ranked_first(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            newest = create_recipe(
+                self.author, name='Салат', text='Картофель и огурцы'
+            )
+        response = self.client.get(
+            '/api/recipes/', {'search': 'картофель', 'limit': 10}
+        )
+        self.assertEqual(
+            [recipe['id'] for recipe in response.data['results']],
+            [self.in_name.id, newest.id]
+        )
+        self.assertEqual(response.data['count'], 2)
+        self.assertIs(response.data['search_truncated'], True)
+
+    @override_settings(RECIPE_SEARCH_CANDIDATES=1)
+    def test_older_name_match_is_kept(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_recipe(self.author, name='Салат', text='Картофель')
+        self.assertEqual(self.search('картофель'), [self.in_name.id])
+
+    def test_anonymous_pages_are_cached_per_query(self):
+        self.search('картофель')
+        response = self.client.get(
+            '/api/recipes/', {'search': 'лук', 'limit': 10}
+        )
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(
+            [recipe['id'] for recipe in response.data['results']],
+            [self.unrelated.id, self.in_text.id]
+        )
+
+    def test_renamed_and_deleted_ingredients(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.butter.name = 'Топлёное масло'
+            self.butter.save()
+        self.assertEqual(self.search('топлёное'), [self.in_ingredients.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ingredient.objects.get(pk=self.butter.pk).delete()
+        self.assertEqual(self.search('топлёное'), [])
+
+    def test_edited_recipe(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe = Recipe.objects.get(pk=self.unrelated.pk)
+            recipe.text = 'Свёкла, капуста и картофель'
+            recipe.save()
+        self.assertIn(self.unrelated.id, self.search('картофель'))
+
+
+class IngredientAutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name in (
+            'Молоко', 'молоко сгущённое', 'Кокосовое молоко', 'Мёд', 'Мука'
+        ):
+            create_ingredient(name=name)
+
+    def setUp(self):
+        clear_caches()
+
+    def autocomplete(self, name, **params):
+        response = api_client().get(
+            '/api/ingredients/', {'name': name, **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        return [ingredient['name'] for ingredient in response.data]
+
+    def test_prefix_matches_go_first(self):
+        self.assertEqual(
+            self.autocomplete('молоко'),
+            ['Молоко', 'молоко сгущённое', 'Кокосовое молоко']
+        )
+
+    def test_case_insensitive_cyrillic(self):
+        self.assertEqual(self.autocomplete('МЁ'), ['Мёд'])
+        self.assertEqual(self.autocomplete(' мУ '), ['Мука'])
+
+    def test_limit(self):
+        self.assertEqual(
+            self.autocomplete('молоко', limit=2),
+            ['Молоко', 'молоко сгущённое']
+        )
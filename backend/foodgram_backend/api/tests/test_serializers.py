@@ -0,0 +1,67 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+
+from recipes.models import Recipe
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from users.models import Follow
+
+from ..recipe.serializers import RecipeReadSerializer, RecipeSerializer
+from ..recipe.views import RecipeViewSet
+from ..renderers import FastJSONRenderer
+from .utils import create_ingredient, create_recipe, create_tag, create_user
+
+
+class RecipeReadSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        authors = [create_user(), create_user(first_name='Анна ')]
+        Follow.objects.create(followers=cls.user, following=authors[0])
+        tags = [create_tag(), create_tag(color='#ff0000')]
+        ingredients = [create_ingredient() for _ in range(3)]
+        for number in range(6):
+            recipe = create_recipe(
+                authors[number % 2],
+                tags=tags[:number % 3],
+                ingredients=[
+                    (ingredient, number * 10)
+                    for ingredient in ingredients[:number % 4]
+                ],
+                image_variants={'thumbnail': 'recipe/images/variants/t.webp'},
+            )
+        cls.user.wish_list.add(recipe)
+        cls.user.shop_list.add(recipe)
+
+    def render(self, user, serializer_class):
+        request = Request(APIRequestFactory().get('/api/recipes/'))
+        request.user = user
+        viewset = RecipeViewSet(
+            request=request, action='list', format_kwarg=None
+        )
+        serializer = serializer_class(
+            viewset.get_queryset().order_by('id'),
+            many=True,
+            context=viewset.get_serializer_context(),
+        )
+        return FastJSONRenderer().render(serializer.data)
+
+    def assert_identical(self, user):
+        self.assertEqual(
+            self.render(user, RecipeReadSerializer),
+            self.render(user, RecipeSerializer)
+        )
+
+    def test_anonymous(self):
+        self.assert_identical(AnonymousUser())
+
+    def test_authenticated(self):
+        self.assert_identical(self.user)
+
+    def test_queryset_without_annotations(self):
+        recipe = Recipe.objects.first()
+        context = {'request': None}
+        self.assertEqual(
+            RecipeReadSerializer(recipe, context=context).data,
+            RecipeSerializer(recipe, context=context).data
+        )
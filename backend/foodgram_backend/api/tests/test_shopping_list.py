@@ -0,0 +1,202 @@
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from recipes.models import ShoppingListExport
+
+from ..recipe import services
+
+from .utils import (
+    api_client,
+    clear_caches,
+    create_ingredient,
+    create_recipe,
+    create_user
+)
+
+
+class ShoppingListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        author = create_user()
+        cls.ingredients = [create_ingredient() for _ in range(5)]
+        cls.recipes = [
+            create_recipe(author, ingredients=[
+                (ingredient, 100) for ingredient in cls.ingredients
+            ])
+            for _ in range(500)
+        ]
+
+    def setUp(self):
+        clear_caches()
+
+    def assert_queries(self, recipes, amount):
+        self.user.shop_list.set(recipes)
+        client = api_client(self.user)
+        # The token and the grouped shopping list.
+        with self.assertNumQueries(2):
+            response = client.get(
+                '/api/recipes/download_shopping_cart/', {'format': 'txt'}
+            )
+            content = b''.join(response.streaming_content).decode()
+        self.assertCountEqual(
+            content.splitlines(),
+            [f'{ingredient.name} (г) -- {amount}'
+             for ingredient in self.ingredients]
+        )
+
+    def test_one_recipe(self):
+        self.assert_queries(self.recipes[:1], 100)
+
+    def test_500_recipes(self):
+        self.assert_queries(self.recipes, 50000)
+
+
+class ShoppingListDownloadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        author = create_user()
+        salt = create_ingredient(name='Соль', measurement_unit='г')
+        milk = create_ingredient(name='Молоко', measurement_unit='мл')
+        cls.recipes = [
+            create_recipe(author, ingredients=[(salt, 5), (milk, 200)]),
+            create_recipe(author, ingredients=[(salt, 10)]),
+        ]
+        cls.user.shop_list.set(cls.recipes)
+
+    def setUp(self):
+        clear_caches()
+        self.client = api_client(self.user)
+
+    def download(self, export_format, **headers):
+        return self.client.get(
+            '/api/recipes/download_shopping_cart/',
+            {'format': export_format},
+            **headers
+        )
+
+    def test_txt(self):
+        response = self.download('txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertEqual(
+            b''.join(response.streaming_content).decode(),
+            'Молоко (мл) -- 200\nСоль (г) -- 15\n'
+        )
+
+    def test_csv(self):
+        response = self.download('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(
+            b''.join(response.streaming_content).decode(),
+            'name,measurement_unit,amount\r\n'
+            'Молоко,мл,200\r\n'
+            'Соль,г,15\r\n'
+        )
+
+    def test_pdf(self):
+        # The standard PDF fonts have no Cyrillic glyphs.
+        recipe = create_recipe(create_user(), ingredients=[
+            (create_ingredient(name='Salt', measurement_unit='g'), 5)
+        ])
+        self.user.shop_list.set([recipe])
+        response = self.download('pdf')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('shopping_list.pdf', response['Content-Disposition'])
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'%PDF'))
+
+        # Served from the shopping-list cache the second time.
+        response = self.download('pdf')
+        self.assertEqual(b''.join(response.streaming_content), content)
+
+    def test_unknown_format(self):
+        self.assertEqual(self.download('xml').status_code, 400)
+
+    def test_async_disabled(self):
+        for value in ('0', 'false', 'no', ''):
+            response = self.client.post(
+                '/api/recipes/download_shopping_cart/'
+                f'?async={value}&format=txt'
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                b''.join(response.streaming_content).decode(),
+                'Молоко (мл) -- 200\nСоль (г) -- 15\n'
+            )
+        self.assertFalse(ShoppingListExport.objects.exists())
+
+    def test_etag(self):
+        etag = self.download('txt')['ETag']
+        self.assertNotEqual(etag, self.download('csv')['ETag'])
+
+        response = self.download('txt', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.user.shop_list.remove(self.recipes[1])
+        response = self.download('txt', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ShoppingListExportTests(TransactionTestCase):
+    """The export worker reads the committed rows from its own thread."""
+
+    def setUp(self):
+        # Workers close their connections after each export, and are
+        # stopped before the test database is flushed.
+        patcher = mock.patch.dict(connection.settings_dict, CONN_MAX_AGE=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.stop_workers)
+
+        clear_caches()
+        self.user = create_user()
+        salt = create_ingredient(name='Соль', measurement_unit='г')
+        self.user.shop_list.add(
+            create_recipe(create_user(), ingredients=[(salt, 5)])
+        )
+        self.client = api_client(self.user)
+
+    def stop_workers(self):
+        services._get_export_executor().shutdown(wait=True)
+        services._export_executor = None
+
+    def wait_for_export(self, url):
+        for _ in range(100):
+            response = self.client.get(url)
+            if response.get('Content-Disposition'):
+                return response
+            self.assertEqual(
+                response.data['status'], ShoppingListExport.PENDING
+            )
+            time.sleep(0.05)
+        self.fail('The export was not rendered')
+
+    def test_lifecycle(self):
+        response = self.client.post(
+            '/api/recipes/download_shopping_cart/?async=1&format=txt'
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], ShoppingListExport.PENDING)
+        url = response['Location']
+        self.assertEqual(
+            url, f'/api/recipes/download_shopping_cart/{response.data["id"]}/'
+        )
+
+        response = self.wait_for_export(url)
+        self.assertEqual(response.content.decode(), 'Соль (г) -- 5\n')
+        self.assertEqual(
+            ShoppingListExport.objects.get().status, ShoppingListExport.DONE
+        )
+
+    def test_other_users_export(self):
+        response = self.client.post(
+            '/api/recipes/download_shopping_cart/?async=1&format=csv'
+        )
+        other = api_client(create_user())
+        self.assertEqual(other.get(response['Location']).status_code, 404)
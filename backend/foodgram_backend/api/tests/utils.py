@@ -0,0 +1,87 @@
+import base64
+from io import BytesIO
+from itertools import count
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from PIL import Image
+
+from recipes.models import Ingredient, Recipe, RecipeIngredients, Tag
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+_sequence = count(1)
+
+
+def create_user(**kwargs):
+    number = next(_sequence)
+    fields = {
+        'username': f'user{number}',
+        'email': f'user{number}@example.com',
+        'first_name': 'Имя',
+        'last_name': 'Фамилия',
+        'password': 'password',
+    }
+    fields.update(kwargs)
+    return User.objects.create(**fields)
+
+
+def create_tag(**kwargs):
+    number = next(_sequence)
+    fields = {'name': f'Тег {number}', 'slug': f'tag{number}'}
+    fields.update(kwargs)
+    return Tag.objects.create(**fields)
+
+
+def create_ingredient(**kwargs):
+    number = next(_sequence)
+    fields = {'name': f'ингредиент {number}', 'measurement_unit': 'г'}
+    fields.update(kwargs)
+    return Ingredient.objects.create(**fields)
+
+
+def create_recipe(author, tags=(), ingredients=(), **kwargs):
+    """A recipe with the given tags and (ingredient, amount) pairs."""
+    number = next(_sequence)
+    fields = {
+        'name': f'Рецепт {number}',
+        'text': 'Описание',
+        'image': 'recipe/images/test.png',
+        'cooking_time': 10,
+    }
+    fields.update(kwargs)
+    recipe = Recipe.objects.create(author=author, **fields)
+    recipe.tag.set(tags)
+    RecipeIngredients.objects.bulk_create(
+        RecipeIngredients(recipe=recipe, ingredient=ingredient, weight=amount)
+        for ingredient, amount in ingredients
+    )
+    return recipe
+
+
+def encode_image(color):
+    content = BytesIO()
+    Image.new('RGB', (640, 480), color).save(content, 'PNG')
+    return base64.b64encode(content.getvalue()).decode()
+
+
+def api_client(user=None):
+    client = APIClient()
+    if user is not None:
+        token, _ = Token.objects.get_or_create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def clear_caches(versions=True):
+    """
+    The page, count and reference caches outlive a test's rollback.
+    Keep the versions to skip the queries that create them on first use.
+    """
+    cache.clear()
+    caches[settings.SHOPPING_LIST_CACHE].clear()
+    if versions:
+        caches[settings.VERSION_CACHE].clear()
@@ -1,8 +1,16 @@
-from django.urls import include, path
+from django.conf import settings
+from django.urls import include, path, re_path
 
 from rest_framework.routers import SimpleRouter
 
+from .monitoring import DatabasePoolStats
+from .recipe.async_views import (
+    AsyncIngredientView,
+    AsyncRecipeView,
+    AsyncTagView,
+)
 from .recipe.views import IngredientViewSet, RecipeViewSet, TagViewSet
+from .users_auth.async_views import AsyncSubscriptionsView
 from .users_auth.views import CustomAuthToken, DeleteToken, UserViewSet
 
 
@@ -16,4 +24,45 @@ urlpatterns = [
     path("", include(router.urls)),
     path("auth/token/login/", CustomAuthToken.as_view()),
     path("auth/token/logout/", DeleteToken.as_view()),
+    path("db_pool/", DatabasePoolStats.as_view()),
 ]
+
+# Async GET handlers in front of the router; every other request of these
+# routes is passed to the router's view.
+drf_views = {pattern.name: pattern.callback for pattern in router.urls}
+async_urlpatterns = [
+    path("tags/", AsyncTagView.as_view(fallback=drf_views["tags-list"])),
+    re_path(
+        r"^tags/(?P<pk>\d+)/$",
+        AsyncTagView.as_view(fallback=drf_views["tags-detail"]),
+    ),
+    path(
+        "ingredients/",
+        AsyncIngredientView.as_view(
+            fallback=drf_views["ingredients-list"]
+        ),
+    ),
+    re_path(
+        r"^ingredients/(?P<pk>\d+)/$",
+        AsyncIngredientView.as_view(
+            fallback=drf_views["ingredients-detail"]
+        ),
+    ),
+    path(
+        "recipes/",
+        AsyncRecipeView.as_view(fallback=drf_views["recipes-list"]),
+    ),
+    re_path(
+        r"^recipes/(?P<pk>\d+)/$",
+        AsyncRecipeView.as_view(fallback=drf_views["recipes-detail"]),
+    ),
+    path(
+        "users/subscriptions/",
+        AsyncSubscriptionsView.as_view(
+            fallback=drf_views["users-subscriptions"]
+        ),
+    ),
+]
+
+if settings.ASYNC_READ_VIEWS:
+    urlpatterns = async_urlpatterns + urlpatterns
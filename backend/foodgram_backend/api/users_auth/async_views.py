@@ -0,0 +1,26 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+
+from .services import get_subscriptions, prefetch_followed_recipes
+from .views import UserViewSet
+from ..async_views import AsyncReadView
+
+
+class AsyncSubscriptionsView(AsyncReadView):
+    viewset_class = UserViewSet
+    authenticated_only = True
+
+    async def get(self, request):
+        viewset = self.get_viewset(request, "subscriptions")
+        recipes_limit = request.GET.get("recipes_limit")
+        recipes_limit = int(recipes_limit) if recipes_limit else None
+
+        page = await sync_to_async(viewset.paginate_queryset)(
+            get_subscriptions(request.user)
+        )
+        if not page:
+            raise Http404
+        await sync_to_async(prefetch_followed_recipes)(page, recipes_limit)
+        return self.render(viewset.get_paginated_response(
+            viewset.get_serializer(page, many=True).data
+        ).data)
@@ -5,6 +5,8 @@ from rest_framework.exceptions import ValidationError
 
 from users.models import Follow
 
+from ..media import media_url
+
 User = get_user_model()
 
 
@@ -28,6 +30,8 @@ class SafeUserSerializer(serializers.ModelSerializer):
         fields = ("email", "id", "username", "first_name", "last_name", "is_subscribed")
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, "is_subscribed"):
+            return obj.is_subscribed
         user = self._user(obj)
         if not user.is_anonymous:
             return Follow.objects.filter(followers=user, following=obj).exists()
@@ -90,7 +94,7 @@ class FollowListSerializer(serializers.ModelSerializer):
             {
                 'id': recipe.id,
                 'name': recipe.name,
-                'image': 'http://51.250.102.77' + recipe.image.url,
+                'image': media_url(recipe.image.name),
                 'cooking_time': recipe.cooking_time,
             } for recipe in recipes]
 
@@ -102,6 +106,6 @@ class FollowListSerializer(serializers.ModelSerializer):
             'last_name': instance.following.last_name,
             'is_subscribed': True,
             'recipes': recipe_to_representation,
-            'recipes_count': instance.following.recipe.count()
+            'recipes_count': instance.following.recipes_count
         }
         return representation
@@ -0,0 +1,34 @@
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models.expressions import RawSQL
+
+from recipes.models import Recipe
+from users.models import Follow
+
+
+def get_subscriptions(user):
+    return Follow.objects.filter(followers=user).select_related("following")
+
+
+def prefetch_followed_recipes(follows, limit=None):
+    """
+    Load the recipes of every followed author on the page in one query,
+    at most limit newest ones per author.
+    """
+    recipes = Recipe.objects.order_by("-created", "-id")
+    if limit:
+        # Django cannot filter on a window function, so the ranking is
+        # done in a subquery.
+        recipes = recipes.filter(
+            pk__in=RawSQL(
+                "SELECT id FROM ("
+                "SELECT id, ROW_NUMBER() OVER ("
+                "PARTITION BY author_id ORDER BY created DESC, id DESC"
+                f") AS position FROM {Recipe._meta.db_table} "
+                "WHERE author_id = ANY(%s)"
+                ") AS ranked WHERE position <= %s",
+                ([follow.following_id for follow in follows], limit),
+            )
+        )
+    prefetch_related_objects(
+        follows, Prefetch("following__recipe", queryset=recipes)
+    )
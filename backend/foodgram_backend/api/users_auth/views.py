@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.http import Http404
 from django.shortcuts import get_list_or_404, get_object_or_404
 
 from rest_framework import status
@@ -18,6 +19,7 @@ from .serializers import (
     UserPasswordChangeSerializer,
     UserSerializer,
 )
+from .services import get_subscriptions, prefetch_followed_recipes
 from ..paginator import CustomPageNumberPagination
 
 User = get_user_model()
@@ -27,6 +29,19 @@ class UserViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = SafeUserSerializer
     pagination_class = CustomPageNumberPagination
+    count_strategy = "approximate"
+
+    @property
+    def cursor_ordering(self):
+        # Keyset pagination (?cursor=) is offered for the subscriptions feed.
+        if self.action == "subscriptions":
+            return ("-created", "-id")
+        return None
+
+    @property
+    def cache_count(self):
+        # Subscriptions change with the user's own requests.
+        return self.action != "subscriptions"
 
     def get_permissions(self):
         if self.action == "retrieve":
@@ -77,20 +92,27 @@ class UserViewSet(ModelViewSet):
     )
     def subscriptions(self, request):
         current_user = request.user
-        queryset = get_list_or_404(Follow, followers=current_user)
-        queryset = self.filter_queryset(queryset)
+        recipes_limit = request.query_params.get("recipes_limit")
+        recipes_limit = int(recipes_limit) if recipes_limit else None
+
+        queryset = get_subscriptions(current_user)
         page = self.paginate_queryset(queryset)
         if page is not None:
+            if not page:
+                raise Http404
+            prefetch_followed_recipes(page, recipes_limit)
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
 
-        serializer = self.get_serializer(queryset, many=True)
+        follows = get_list_or_404(queryset)
+        prefetch_followed_recipes(follows, recipes_limit)
+        serializer = self.get_serializer(follows, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @action(
         detail=False,
         methods=["post", "delete"],
-        url_path="(?P<user_pk>[^/.])/subscribe",
+        url_path="(?P<user_pk>[^/.]+)/subscribe",
         permission_classes=[IsAuthenticated],
     )
     def add_subscriptions(self, request, user_pk=None):
@@ -0,0 +1,20 @@
+"""
+Benchmarks of the API against a local PostgreSQL database. Run them from
+backend/foodgram_backend, e.g. ``python -m benchmarks.search``, with the
+DB_* variables pointing at a scratch database: benchmarks.fixtures adds up
+to hundreds of thousands of "bench" rows and keeps them for later runs.
+"""
+import os
+
+import django
+from django.apps import apps
+from django.test.utils import setup_test_environment
+
+# Already done when the test runner imports the package.
+if not apps.ready:
+    os.environ.setdefault(
+        'DJANGO_SETTINGS_MODULE', 'foodgram_backend.settings'
+    )
+    django.setup()
+    # Allows the test client's host and turns query logging off.
+    setup_test_environment(debug=False)
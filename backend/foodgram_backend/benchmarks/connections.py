@@ -0,0 +1,113 @@
+"""
+Load test of the database connection handling: concurrent clients sending
+requests through the WSGI handler in one process, one thread per client.
+
+    python -m benchmarks.connections --clients 200
+    DB_ENGINE=foodgram_backend.postgresql_pool DB_CONN_MAX_AGE=0 \\
+        python -m benchmarks.connections --clients 200
+
+Prints throughput, latency, failed requests and the peak number of server
+connections of the database, plus the pool statistics for the pooled
+backend. The stock backend opens a connection per thread, so it fails once
+the clients outnumber PostgreSQL's max_connections.
+"""
+import argparse
+from collections import Counter
+import threading
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import RequestFactory
+import psycopg2
+
+from . import fixtures
+from .utils import percentile
+
+PATHS = ('/api/recipes/?limit=6', '/api/recipes/{recipe_id}/')
+
+
+def count_connections(cursor):
+    cursor.execute(
+        'SELECT count(*) FROM pg_stat_activity WHERE datname = %s',
+        [settings.DATABASES['default']['NAME']],
+    )
+    return cursor.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=10_000)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=20,
+                        help='per client')
+    options = parser.parse_args()
+
+    recipe_id = fixtures.seed_recipes(options.recipes).order_by('pk')[0].pk
+    monitor = psycopg2.connect(**connection.get_connection_params())
+    monitor.autocommit = True
+    connection.close()
+
+    handler = WSGIHandler()
+    factory = RequestFactory()
+    barrier = threading.Barrier(options.clients + 1)
+    lock = threading.Lock()
+    latencies = []
+    errors = Counter()
+
+    def client(number):
+        samples = []
+        barrier.wait()
+        for request in range(options.requests):
+            path = PATHS[(number + request) % len(PATHS)]
+            environ = factory.get(path.format(recipe_id=recipe_id)).environ
+            started = time.perf_counter()
+            try:
+                response = handler(environ, lambda status, headers: None)
+                b''.join(response)
+                response.close()
+                if response.status_code != 200:
+                    errors[response.status_code] += 1
+            except Exception as exc:
+                errors[type(exc).__name__] += 1
+            samples.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [
+        threading.Thread(target=client, args=(number,))
+        for number in range(options.clients)
+    ]
+    for thread in threads:
+        thread.start()
+    peak = 0
+    with monitor.cursor() as cursor:
+        barrier.wait()
+        started = time.perf_counter()
+        while any(thread.is_alive() for thread in threads):
+            peak = max(peak, count_connections(cursor))
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+    monitor.close()
+
+    engine = settings.DATABASES['default']['ENGINE']
+    print(
+        f'{engine}, CONN_MAX_AGE '
+        f'{settings.DATABASES["default"]["CONN_MAX_AGE"]}, '
+        f'{options.clients} clients'
+    )
+    print(
+        f'{len(latencies) / elapsed:7.0f} requests/s  '
+        f'median {percentile(latencies, 50):8.1f} ms  '
+        f'p95 {percentile(latencies, 95):8.1f} ms  '
+        f'peak connections {peak}'
+    )
+    print(f'failed {sum(errors.values())} {dict(errors)}')
+    if engine == 'foodgram_backend.postgresql_pool':
+        from foodgram_backend.postgresql_pool.base import get_pool_stats
+        print(get_pool_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Bulk benchmark data. Recipes are named "bench<number> ..." and loaded
+with COPY, so hundreds of thousands of them take a few minutes; they are
+kept between runs and only the missing ones are added.
+"""
+from datetime import timedelta
+import io
+import random
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from recipes.models import Ingredient, Recipe, RecipeIngredients, Tag
+from recipes.search import update_search_vectors
+
+User = get_user_model()
+
+PREFIX = 'bench'
+AUTHORS = 100
+TAGS = 6
+INGREDIENTS_PER_RECIPE = 5
+COOKING_WORDS = (
+    'нарезать обжарить варить запекать смешать добавить посолить '
+    'поперчить духовка сковорода кастрюля минут огонь соус тесто начинка '
+    'подавать горячим холодным быстро вкусно домашний праздничный ужин '
+    'завтрак обед салат суп пирог котлеты каша запеканка рагу плов блины '
+    'оладьи'
+).split()
+
+
+def get_user(username=f'{PREFIX}_user'):
+    user, created = User.objects.get_or_create(
+        username=username,
+        defaults={
+            'email': f'{username}@example.com',
+            'first_name': 'Бенчмарк',
+            'last_name': 'Бенчмарк',
+        },
+    )
+    if created:
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+    return user
+
+
+def get_authors():
+    return [
+        get_user(f'{PREFIX}_author{number}') for number in range(AUTHORS)
+    ]
+
+
+def get_tags():
+    return [
+        Tag.objects.get_or_create(
+            slug=f'{PREFIX}-{number}',
+            defaults={'name': f'Бенчмарк {number}', 'color': '#000000'},
+        )[0]
+        for number in range(1, TAGS + 1)
+    ]
+
+
+def get_ingredients():
+    if Ingredient.objects.count() < 100:
+        call_command('load_ingredients', verbosity=0)
+    return list(Ingredient.objects.values_list('pk', 'name'))
+
+
+def _copy(table, columns, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(str(value) for value in row) + '\n')
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {table} ({", ".join(columns)}) FROM STDIN', buffer
+        )
+
+
+def seed_recipes(count, seed=0):
+    """
+    Make sure at least count benchmark recipes exist and return them. Each
+    has INGREDIENTS_PER_RECIPE ingredients, every benchmark tag with
+    probability 1/2 (at least one), and a text of ingredient and cooking
+    words for full-text search.
+    """
+    recipes = Recipe.objects.filter(name__startswith=PREFIX)
+    existing = recipes.count()
+    if existing >= count:
+        return recipes
+
+    rng = random.Random(seed + existing)
+    authors = get_authors()
+    tags = get_tags()
+    ingredients = get_ingredients()
+    words = sorted({
+        word.lower()
+        for _, name in ingredients
+        for word in re.split(r'\W+', name)
+        if len(word) > 2 and not word.isdigit()
+    }) + COOKING_WORDS
+    now = timezone.now()
+    numbers = range(existing + 1, count + 1)
+
+    with transaction.atomic():
+        last_id = Recipe.objects.aggregate(last_id=Max('pk'))['last_id'] or 0
+        _copy(
+            Recipe._meta.db_table,
+            (
+                'created', 'author_id', 'name', 'text', 'image',
+                'image_variants', 'cooking_time', 'favorites_count',
+                'in_carts_count',
+            ),
+            (
+                (
+                    (now - timedelta(minutes=number)).isoformat(),
+                    authors[number % AUTHORS].pk,
+                    f'{PREFIX}{number} ' + ' '.join(rng.choices(words, k=2)),
+                    ' '.join(rng.choices(words, k=25 + number % 20)),
+                    'recipe/images/bench.png',
+                    '{}',
+                    1 + number % 120,
+                    number % 50,
+                    number % 20,
+                )
+                for number in numbers
+            ),
+        )
+        recipe_ids = list(
+            recipes.filter(pk__gt=last_id).values_list('pk', flat=True)
+        )
+        _copy(
+            Recipe.tag.through._meta.db_table,
+            ('recipe_id', 'tag_id'),
+            (
+                (recipe_id, tag.pk)
+                for recipe_id in recipe_ids
+                for tag in (
+                    [tag for tag in tags if rng.random() < 0.5]
+                    or [rng.choice(tags)]
+                )
+            ),
+        )
+        _copy(
+            RecipeIngredients._meta.db_table,
+            ('recipe_id', 'ingredient_id', 'weight'),
+            (
+                (recipe_id, ingredient_id, rng.randint(1, 500))
+                for recipe_id in recipe_ids
+                for ingredient_id, _ in rng.sample(
+                    ingredients, INGREDIENTS_PER_RECIPE
+                )
+            ),
+        )
+        update_search_vectors(recipes.filter(pk__gt=last_id))
+
+    # recipes_tag is too small for autovacuum to analyze it again, and
+    # stale estimates from before the benchmark tags make the planner
+    # scan the whole (tag, recipe) index to prefetch a page's tags.
+    with connection.cursor() as cursor:
+        for model in (Recipe, Recipe.tag.through, RecipeIngredients, Tag):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+    return recipes
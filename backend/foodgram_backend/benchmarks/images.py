@@ -0,0 +1,124 @@
+"""
+Request latency and bytes served for a recipe list page of photos.
+
+    python -m benchmarks.images --recipes 12
+
+Creates recipes with distinct 3000x2000 JPEG photos through the API,
+waits for their variants, then reads them back as one list page. The
+bytes a client downloads for that page are the JSON plus either the
+original images or the card variants. Images are stored in a temporary
+MEDIA_ROOT, and the recipes are deleted afterwards.
+"""
+import argparse
+import base64
+from io import BytesIO
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from PIL import Image
+
+from recipes.models import Recipe
+
+from . import fixtures
+from .utils import api_client, measure, summary
+
+PREFIX = 'image-bench'
+SIZE = (3000, 2000)
+
+
+def random_image(width, height):
+    return Image.frombytes(
+        'RGB', (width, height), os.urandom(width * height * 3)
+    ).resize(SIZE, Image.BICUBIC)
+
+
+def encode_photo():
+    """
+    A JPEG that compresses like a photo: coarse detail that survives
+    downscaling, plus sensor-like noise.
+    """
+    photo = Image.blend(
+        random_image(SIZE[0] // 16, SIZE[1] // 16),
+        random_image(*SIZE), 0.2
+    )
+    content = BytesIO()
+    photo.save(content, 'JPEG', quality=90)
+    return base64.b64encode(content.getvalue()).decode()
+
+
+def wait_for_variants(recipe_ids, timeout=120):
+    deadline = time.monotonic() + timeout
+    while Recipe.objects.filter(pk__in=recipe_ids, image_variants={}).exists():
+        assert time.monotonic() < deadline, 'variants were not built'
+        time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    user = fixtures.get_user(f'{fixtures.PREFIX}_images')
+    client = api_client(user)
+    tag_ids = [tag.pk for tag in fixtures.get_tags()]
+    ingredient_ids = [pk for pk, _ in fixtures.get_ingredients()[:3]]
+    photos = iter([encode_photo() for _ in range(options.recipes + 1)])
+    numbers = iter(range(options.recipes + 1))
+    recipe_ids = []
+
+    def create():
+        response = client.post('/api/recipes/', {
+            'ingredients': [
+                {'id': pk, 'amount': 100} for pk in ingredient_ids
+            ],
+            'tags': tag_ids,
+            'image': next(photos),
+            'name': f'{PREFIX}{next(numbers)}',
+            'text': 'Нарезать, смешать и запекать 20 минут.',
+            'cooking_time': 20,
+        }, format='json')
+        assert response.status_code == 201, response.content
+        recipe_ids.append(response.data['id'])
+
+    def get_page():
+        cache.clear()
+        response = client.get(
+            '/api/recipes/', {'author': user.pk, 'limit': options.recipes}
+        )
+        assert response.status_code == 200, response.content
+        return response
+
+    media_root = tempfile.mkdtemp()
+    Recipe.objects.filter(name__startswith=PREFIX).delete()
+    try:
+        with override_settings(MEDIA_ROOT=media_root):
+            created = measure(create, options.recipes)
+            wait_for_variants(recipe_ids)
+            listed = measure(get_page, options.repeat)
+            response = get_page()
+            json_bytes = len(response.content)
+            page_ids = [item['id'] for item in response.data['results']]
+            originals = cards = 0
+            for recipe in Recipe.objects.filter(pk__in=page_ids):
+                originals += default_storage.size(recipe.image.name)
+                cards += default_storage.size(recipe.image_variants['card'])
+    finally:
+        Recipe.objects.filter(name__startswith=PREFIX).delete()
+        shutil.rmtree(media_root)
+
+    print('create      ' + summary(created))
+    print('list page   ' + summary(listed))
+    print(f'{len(page_ids)} recipes per page, JSON {json_bytes} bytes')
+    for label, image_bytes in (('originals', originals), ('cards', cards)):
+        total = json_bytes + image_bytes
+        print(f'  with {label:9} {total:>10} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Joins and time of the queries that read recipe ingredients: the
+ingredient prefetch of a recipe list page and the shopping-list
+aggregation.
+
+    python -m benchmarks.ingredient_joins --cart 200
+
+The aggregation is also run with the recipe__user_shoplist filter it
+used before, which joins recipes_recipe and the shop_list table instead
+of matching recipe_id against the shop_list rows.
+"""
+import argparse
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+
+from api.recipe.services import get_shopping_list
+from recipes.models import RecipeIngredients
+
+from . import fixtures
+from .utils import api_client, measure, summary
+
+USERNAME = f'{fixtures.PREFIX}_joins'
+
+
+def count_joins(sql):
+    return sql.count(' JOIN ')
+
+
+def execution_time(sql):
+    """Server-side milliseconds reported by EXPLAIN ANALYZE."""
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (ANALYZE, FORMAT JSON) ' + sql)
+        return cursor.fetchone()[0][0]['Execution Time']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=10_000)
+    parser.add_argument('--cart', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    recipes = fixtures.seed_recipes(options.recipes)
+    user = fixtures.get_user(USERNAME)
+    user.shop_list.set(
+        recipes.order_by('pk').values_list('pk', flat=True)[:options.cart]
+    )
+    client = api_client(user)
+
+    def get_page():
+        cache.clear()
+        response = client.get('/api/recipes/', {'limit': options.limit})
+        assert response.status_code == 200, response.content
+
+    with CaptureQueriesContext(connection) as queries:
+        get_page()
+    prefetch = next(
+        query['sql'] for query in queries
+        if 'FROM "recipes_recipeingredients"' in query['sql']
+    )
+    print(
+        f'list page of {options.limit}: ingredient prefetch '
+        f'{count_joins(prefetch)} joins, request '
+        + summary(measure(get_page, options.repeat))
+    )
+
+    def old_shopping_list():
+        return list(
+            RecipeIngredients.objects
+            .filter(recipe__user_shoplist=user)
+            .values_list('ingredient__name', 'ingredient__measurement_unit')
+            .annotate(amount=Sum('weight'))
+            .order_by('ingredient__name', 'ingredient__measurement_unit')
+        )
+
+    for label, func in (
+        ('shop_list rows', lambda: get_shopping_list(user)),
+        ('recipe join', old_shopping_list),
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            items = len(func())
+        sql = queries[0]['sql']
+        server = [execution_time(sql) for _ in range(options.repeat)]
+        print(
+            f'shopping list, {options.cart} recipes, {items} items, '
+            f'{label}: {count_joins(sql)} joins'
+        )
+        print('    request ' + summary(measure(func, options.repeat)))
+        print('    server  ' + summary(server))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Requests per second of anonymous recipe list pages with and without the
+page cache, and the cache's hit and miss counters.
+
+    python -m benchmarks.page_cache --recipes 10000 --requests 1000
+
+The requests cycle through the first pages of the feed, tag filters and
+authors. Without the cache, pages are stored with a timeout of 0, so
+every request is a miss.
+"""
+import argparse
+from itertools import cycle, islice
+import time
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from api.recipe.page_cache import get_stats, reset_stats
+
+from . import fixtures
+from .utils import api_client
+
+
+def get_urls(tags):
+    urls = [f'/api/recipes/?page={page}' for page in range(1, 6)]
+    urls += [f'/api/recipes/?tags={tag.slug}' for tag in tags]
+    urls += [
+        f'/api/recipes/?author={author.pk}'
+        for author in fixtures.get_authors()[:5]
+    ]
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=1000)
+    options = parser.parse_args()
+
+    fixtures.seed_recipes(options.recipes)
+    urls = get_urls(fixtures.get_tags())
+    client = api_client()
+
+    def run():
+        cache.clear()
+        reset_stats()
+        started = time.perf_counter()
+        for url in islice(cycle(urls), options.requests):
+            response = client.get(url)
+            assert response.status_code == 200, response.content
+        return options.requests / (time.perf_counter() - started)
+
+    with override_settings(RECIPE_LIST_CACHE_TIMEOUT=0):
+        uncached = run()
+    hits, misses = get_stats()
+    print(f'uncached {uncached:7.0f} requests/s  hits {hits} misses {misses}')
+
+    cached = run()
+    hits, misses = get_stats()
+    print(
+        f'cached   {cached:7.0f} requests/s  hits {hits} misses {misses}  '
+        f'x{cached / uncached:.1f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
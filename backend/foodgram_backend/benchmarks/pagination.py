@@ -0,0 +1,64 @@
+"""
+Latency of the first and the 5,000th page of the recipe feed, by page
+number and by cursor.
+
+    python -m benchmarks.pagination --recipes 100000 --limit 10
+
+The deep cursor points at the last recipe of page 4,999, as the next
+link of that page would. Every request starts with empty page and count
+caches.
+"""
+import argparse
+from base64 import b64encode
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Recipe
+
+from . import fixtures
+from .utils import api_client, measure, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--page', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    fixtures.seed_recipes(options.recipes)
+    created, pk = Recipe.objects.order_by('-created', '-pk').values_list(
+        'created', 'pk'
+    )[(options.page - 1) * options.limit - 1]
+    cursor = b64encode(f'{created.isoformat()}|{pk}'.encode()).decode()
+    client = api_client()
+
+    cases = (
+        ('page 1', {}),
+        (f'page {options.page}', {'page': options.page}),
+        ('cursor, first', {'cursor': ''}),
+        (f'cursor, page {options.page}', {'cursor': cursor}),
+    )
+    for label, params in cases:
+        params = {'limit': options.limit, **params}
+
+        def get_page():
+            cache.clear()
+            response = client.get('/api/recipes/', params)
+            assert response.status_code == 200, response.content
+            return response.data['results']
+
+        with CaptureQueriesContext(connection) as queries:
+            first_id = get_page()[0]['id']
+        query_count = len(queries)
+        print(
+            f'{label:20} first id {first_id:>7}  {query_count} queries  '
+            + summary(measure(get_page, options.repeat))
+        )
+
+
+if __name__ == '__main__':
+    main()
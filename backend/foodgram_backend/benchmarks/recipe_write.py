@@ -0,0 +1,97 @@
+"""
+Recipe create and update throughput through the API.
+
+    python -m benchmarks.recipe_write --recipes 200 --ingredients 30
+
+Each recipe is created with POST /api/recipes/ and then rewritten with
+PATCH, both with the given number of ingredients and all benchmark tags.
+Images are stored in a temporary MEDIA_ROOT, and the recipes are deleted
+afterwards.
+"""
+import argparse
+import base64
+from io import BytesIO
+import shutil
+import tempfile
+
+from django.test import override_settings
+from PIL import Image
+
+from recipes.models import Recipe
+
+from . import fixtures
+from .utils import api_client, measure, summary
+
+PREFIX = 'write-bench'
+
+
+def encode_image(color):
+    content = BytesIO()
+    Image.new('RGB', (640, 480), color).save(content, 'JPEG')
+    return base64.b64encode(content.getvalue()).decode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=200)
+    parser.add_argument('--ingredients', type=int, default=30)
+    options = parser.parse_args()
+
+    client = api_client(fixtures.get_user())
+    tag_ids = [tag.pk for tag in fixtures.get_tags()]
+    ingredient_ids = [pk for pk, _ in fixtures.get_ingredients()]
+    images = [encode_image('red'), encode_image('blue')]
+
+    def payload(number, version):
+        return {
+            'ingredients': [
+                {'id': pk, 'amount': 10 + version}
+                for pk in ingredient_ids[
+                    version:version + options.ingredients
+                ]
+            ],
+            'tags': tag_ids[version:],
+            'image': images[version],
+            'name': f'{PREFIX}{number}',
+            'text': 'Нарезать, смешать и запекать 20 минут.',
+            'cooking_time': 20 + version,
+        }
+
+    # measure() makes one more call to warm up.
+    numbers = iter(range(options.recipes + 1))
+    recipe_ids = []
+
+    def create():
+        response = client.post(
+            '/api/recipes/', payload(next(numbers), 0), format='json'
+        )
+        assert response.status_code == 201, response.content
+        recipe_ids.append(response.data['id'])
+
+    def update():
+        recipe_id = next(to_update)
+        response = client.patch(
+            f'/api/recipes/{recipe_id}/', payload(recipe_id, 1),
+            format='json'
+        )
+        assert response.status_code == 200, response.content
+
+    media_root = tempfile.mkdtemp()
+    Recipe.objects.filter(name__startswith=PREFIX).delete()
+    try:
+        with override_settings(MEDIA_ROOT=media_root):
+            created = measure(create, options.recipes)
+            to_update = iter(recipe_ids)
+            updated = measure(update, options.recipes)
+    finally:
+        Recipe.objects.filter(name__startswith=PREFIX).delete()
+        shutil.rmtree(media_root)
+
+    print(f'{options.ingredients} ingredients, {len(tag_ids)} tags')
+    for label, samples in (('create', created), ('update', updated)):
+        throughput = len(samples) / sum(samples) * 1000
+        print(f'{label}  {throughput:7.1f} recipes/s  ' + summary(samples))
+
+
+if __name__ == '__main__':
+    main()
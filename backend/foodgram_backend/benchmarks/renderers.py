@@ -0,0 +1,61 @@
+"""
+Encode time and output size of DRF's JSONRenderer against FastJSONRenderer
+on real API payloads.
+
+    python -m benchmarks.renderers --recipes 10000
+
+The payloads are the response data of the ingredient list, a page of 100
+recipes and a page of subscriptions, taken before rendering.
+"""
+import argparse
+
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+from users.models import Follow
+
+from . import fixtures
+from .utils import api_client, measure, summary
+
+FOLLOWED_AUTHORS = 20
+PAYLOADS = (
+    ('ingredients', '/api/ingredients/'),
+    ('recipes', '/api/recipes/?limit=100'),
+    ('subscriptions', '/api/users/subscriptions/?limit=20&recipes_limit=3'),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    options = parser.parse_args()
+
+    fixtures.seed_recipes(options.recipes)
+    user = fixtures.get_user()
+    for number in range(FOLLOWED_AUTHORS):
+        Follow.objects.get_or_create(
+            followers=user,
+            following=fixtures.get_user(f'{fixtures.PREFIX}_author{number}'),
+        )
+    client = api_client(user)
+
+    for label, url in PAYLOADS:
+        response = client.get(url)
+        assert response.status_code == 200, response.content
+        data = response.data
+        results = {}
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            output = renderer.render(data)
+            samples = measure(lambda: renderer.render(data), options.repeat)
+            results[type(renderer).__name__] = output
+            print(
+                f'{label:13} {type(renderer).__name__:17} '
+                f'{len(output):>9} bytes  ' + summary(samples)
+            )
+        outputs = set(results.values())
+        print(f'{label:13} identical output: {len(outputs) == 1}')
+
+
+if __name__ == '__main__':
+    main()
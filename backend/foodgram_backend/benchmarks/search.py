@@ -0,0 +1,61 @@
+"""
+Latency of ranked recipe search (?search=) on a large table.
+
+    python -m benchmarks.search --recipes 500000 --budget 50
+
+Every request starts with empty page and count caches. Exits with status 1
+when the p95 latency exceeds the budget.
+"""
+import argparse
+import sys
+
+from django.core.cache import cache
+
+from . import fixtures
+from .utils import api_client, measure, percentile, summary
+
+QUERIES = (
+    'соус', 'морковь', 'курица', 'запекать духовка', 'пирог яблоко', 'сыр',
+    'рис', 'молоко', 'говядина', 'суп', '"домашний ужин"',
+    'картофель -масло', 'шоколад', 'лук', 'чеснок',
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=500_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--limit', type=int, default=6)
+    parser.add_argument('--budget', type=float, default=50, help='p95, ms')
+    options = parser.parse_args()
+
+    fixtures.seed_recipes(options.recipes)
+    client = api_client(fixtures.get_user())
+
+    def search(query):
+        cache.clear()
+        response = client.get(
+            '/api/recipes/', {'search': query, 'limit': options.limit}
+        )
+        assert response.status_code == 200, response.content
+        return response.data
+
+    samples = []
+    for query in QUERIES:
+        query_samples = measure(lambda: search(query), options.repeat)
+        samples += query_samples
+        data = search(query)
+        print(
+            f'{query:20} count {data["count"]:>5} '
+            f'truncated {data["search_truncated"]!s:5}  '
+            + summary(query_samples)
+        )
+    print(f'{"all":20} {"":22}' + summary(samples))
+
+    if percentile(samples, 95) > options.budget:
+        print(f'p95 is over the {options.budget:g} ms budget')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
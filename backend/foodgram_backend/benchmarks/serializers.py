@@ -0,0 +1,64 @@
+"""
+Time to serialize 1,000 recipes with RecipeSerializer and with
+RecipeReadSerializer.
+
+    python -m benchmarks.serializers --recipes 1000
+
+The recipes are loaded once with the list view's queryset and
+prefetches, so only serialization is timed. Runs as an anonymous and as
+an authenticated user.
+"""
+import argparse
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.recipe.serializers import RecipeReadSerializer, RecipeSerializer
+from api.recipe.views import RecipeViewSet
+
+from . import fixtures
+from .utils import measure, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    options = parser.parse_args()
+
+    recipe_ids = list(
+        fixtures.seed_recipes(options.recipes)
+        .order_by('pk').values_list('pk', flat=True)[:options.recipes]
+    )
+    for user in (AnonymousUser(), fixtures.get_user()):
+        request = Request(APIRequestFactory().get('/api/recipes/'))
+        request.user = user
+        view = RecipeViewSet(
+            request=request, action='list', format_kwarg=None, kwargs={}
+        )
+        recipes = list(view.get_queryset().filter(pk__in=recipe_ids))
+        context = {'request': request, 'view': view}
+
+        outputs = set()
+        label = 'anonymous' if user.is_anonymous else 'authenticated'
+        for serializer_class in (RecipeSerializer, RecipeReadSerializer):
+            def serialize():
+                return serializer_class(
+                    recipes, many=True, context=context
+                ).data
+
+            outputs.add(JSONRenderer().render(serialize()))
+            samples = measure(serialize, options.repeat)
+            scale = 1000 / len(recipes)
+            print(
+                f'{label:13} {serializer_class.__name__:20} '
+                f'per 1,000 recipes: '
+                + summary([sample * scale for sample in samples])
+            )
+        print(f'{label:13} identical output: {len(outputs) == 1}')
+
+
+if __name__ == '__main__':
+    main()
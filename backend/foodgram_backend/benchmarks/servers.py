@@ -0,0 +1,209 @@
+"""
+Throughput of one server process under WSGI and under ASGI with the async
+read views.
+
+    python -m benchmarks.servers --clients 50 --duration 15 --db-latency 2
+
+Each configuration starts gunicorn with a single worker, and keep-alive
+clients request the recipe list, a recipe, the subscriptions and the
+tags for the given duration. With --db-latency every packet to and from
+PostgreSQL goes through a local proxy that holds it for that many
+milliseconds, as a database on another host would.
+"""
+import argparse
+import asyncio
+from itertools import cycle
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from rest_framework.authtoken.models import Token
+
+from users.models import Follow
+
+from . import fixtures
+from .utils import percentile
+
+WSGI = 'foodgram_backend.wsgi:application'
+ASGI = 'foodgram_backend.asgi:application'
+POOLED = {
+    'DB_ENGINE': 'foodgram_backend.postgresql_pool',
+    'DB_CONN_MAX_AGE': '0',
+}
+CONFIGS = (
+    ('wsgi, sync worker', WSGI, [], {}),
+    ('wsgi, 8 threads', WSGI, ['--threads', '8'], {}),
+    (
+        'asgi, async views',
+        ASGI,
+        ['--worker-class', 'uvicorn.workers.UvicornWorker'],
+        {'ASYNC_READ_VIEWS': 'True', **POOLED},
+    ),
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def open_database():
+    database = settings.DATABASES['default']
+    if database['HOST'].startswith('/'):
+        return await asyncio.open_unix_connection(
+            f'{database["HOST"]}/.s.PGSQL.{database["PORT"]}'
+        )
+    return await asyncio.open_connection(database['HOST'], database['PORT'])
+
+
+async def start_latency_proxy(port, latency):
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(latency / 1000)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        server_reader, server_writer = await open_database()
+        await asyncio.gather(
+            pipe(client_reader, server_writer),
+            pipe(server_reader, client_writer),
+        )
+
+    return await asyncio.start_server(handle, '127.0.0.1', port)
+
+
+async def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            assert time.monotonic() < deadline, 'the server did not start'
+            await asyncio.sleep(0.2)
+        else:
+            writer.close()
+            return
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(
+        (name.strip().lower(), value.strip())
+        for name, _, value in (line.partition(':') for line in lines[1:])
+    )
+    if headers.get('transfer-encoding') == 'chunked':
+        while size := int((await reader.readuntil(b'\r\n')).strip(), 16):
+            await reader.readexactly(size + 2)
+        await reader.readexactly(2)
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+    return int(lines[0].split()[1]), headers.get('connection') == 'close'
+
+
+async def run_clients(port, paths, token, clients, duration):
+    latencies = []
+    errors = 0
+
+    async def client(offset):
+        nonlocal errors
+        requests = cycle(
+            (
+                f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+                f'Authorization: Token {token}\r\n\r\n'
+            ).encode()
+            for path in paths[offset:] + paths[:offset]
+        )
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(next(requests))
+            status, close = await read_response(reader)
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += status != 200
+            if close:
+                writer.close()
+                reader, writer = await asyncio.open_connection(
+                    '127.0.0.1', port
+                )
+        writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client(number % len(paths)) for number in range(clients))
+    )
+    return latencies, errors, time.perf_counter() - started
+
+
+async def benchmark(options, paths, token):
+    env = os.environ.copy()
+    proxy = None
+    if options.db_latency:
+        proxy_port = free_port()
+        proxy = await start_latency_proxy(proxy_port, options.db_latency)
+        env.update(DB_HOST='127.0.0.1', DB_PORT=str(proxy_port))
+
+    for label, application, arguments, config_env in CONFIGS:
+        port = free_port()
+        server = await asyncio.create_subprocess_exec(
+            sys.executable, '-m', 'gunicorn', application,
+            '--workers', '1', '--bind', f'127.0.0.1:{port}', *arguments,
+            env={**env, **config_env}, cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            await wait_until_up(port)
+            # Warm up connections and caches.
+            await run_clients(port, paths, token, options.clients, 2)
+            latencies, errors, elapsed = await run_clients(
+                port, paths, token, options.clients, options.duration
+            )
+        finally:
+            server.terminate()
+            await server.wait()
+        print(
+            f'{label:18} {len(latencies) / elapsed:7.0f} requests/s  '
+            f'median {percentile(latencies, 50):7.1f} ms  '
+            f'p95 {percentile(latencies, 95):7.1f} ms  errors {errors}'
+        )
+
+    if proxy is not None:
+        proxy.close()
+        await proxy.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=10_000)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--db-latency', type=float, default=0, help='ms')
+    options = parser.parse_args()
+
+    recipe = fixtures.seed_recipes(options.recipes).order_by('pk').first()
+    user = fixtures.get_user()
+    for author in fixtures.get_authors()[:10]:
+        Follow.objects.get_or_create(followers=user, following=author)
+    token = Token.objects.get_or_create(user=user)[0].key
+    paths = [
+        '/api/recipes/?limit=6',
+        f'/api/recipes/{recipe.pk}/',
+        '/api/users/subscriptions/?recipes_limit=3',
+        '/api/tags/',
+    ]
+    asyncio.run(benchmark(options, paths, token))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Peak memory of a shopping-list download with 1,000 items.
+
+    python -m benchmarks.shopping_list --items 1000
+
+Each format is downloaded in a fresh process, which prints how far the
+download raised the peak resident set size above the process's size
+before the request, along with the response size and time.
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+from api.recipe.services import EXPORT_FORMATS
+from recipes.models import RecipeIngredients
+
+from . import fixtures
+from .utils import api_client
+
+USERNAME = f'{fixtures.PREFIX}_cart'
+
+
+def fill_cart(user, items):
+    """Put benchmark recipes in the cart until it lists items ingredients."""
+    recipe_ids, ingredient_ids = set(), set()
+    rows = RecipeIngredients.objects.filter(
+        recipe__in=fixtures.seed_recipes(items)
+    ).order_by('recipe').values_list('recipe', 'ingredient')
+    for recipe_id, ingredient_id in rows.iterator():
+        if len(ingredient_ids) >= items and recipe_id not in recipe_ids:
+            break
+        recipe_ids.add(recipe_id)
+        ingredient_ids.add(ingredient_id)
+    user.shop_list.set(recipe_ids)
+    return len(ingredient_ids)
+
+
+def peak_rss():
+    # Kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def download(export_format):
+    client = api_client(fixtures.get_user(USERNAME))
+    before = peak_rss()
+    started = time.perf_counter()
+    response = client.get(
+        '/api/recipes/download_shopping_cart/', {'format': export_format}
+    )
+    if response.status_code != 200:
+        print(f'{export_format:4} failed with {response.status_code}')
+        return
+    size = sum(len(chunk) for chunk in response.streaming_content)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f'{export_format:4} {size:>9} bytes  {elapsed:8.1f} ms  '
+        f'peak RSS +{(peak_rss() - before) / 2 ** 20:6.1f} MiB '
+        f'(of {peak_rss() / 2 ** 20:.1f} MiB)'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--format', choices=EXPORT_FORMATS)
+    options = parser.parse_args()
+
+    if options.format:
+        download(options.format)
+        return
+
+    items = fill_cart(fixtures.get_user(USERNAME), options.items)
+    print(f'{items} items')
+    for export_format in EXPORT_FORMATS:
+        subprocess.run(
+            [sys.executable, '-m', __spec__.name, '--format', export_format],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
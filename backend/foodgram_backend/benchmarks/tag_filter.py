@@ -0,0 +1,49 @@
+"""
+Latency of the recipe list filtered by 1 to 6 tags.
+
+    python -m benchmarks.tag_filter --recipes 100000
+
+Every benchmark recipe carries each of the 6 benchmark tags with
+probability 1/2, so each extra tag halves the matches. Every request
+starts with empty page and count caches.
+"""
+import argparse
+
+from django.core.cache import cache
+
+from recipes.models import Recipe
+
+from . import fixtures
+from .utils import api_client, measure, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=6)
+    options = parser.parse_args()
+
+    fixtures.seed_recipes(options.recipes)
+    slugs = [tag.slug for tag in fixtures.get_tags()]
+    client = api_client()
+    print(f'{Recipe.objects.count()} recipes')
+
+    for count in range(1, len(slugs) + 1):
+        params = {'tags': slugs[:count], 'limit': options.limit}
+
+        def get_page():
+            cache.clear()
+            response = client.get('/api/recipes/', params)
+            assert response.status_code == 200, response.content
+            return response.data
+
+        samples = measure(get_page, options.repeat)
+        print(
+            f'{count} tags  count {get_page()["count"]:>6}  '
+            + summary(samples)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import gc
+import statistics
+import time
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+
+def api_client(user=None):
+    client = APIClient()
+    if user is not None:
+        token, _ = Token.objects.get_or_create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def measure(func, repeat, warmup=1):
+    """
+    Milliseconds taken by each of repeat calls of func, with the garbage
+    collector off as in timeit.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return samples
+
+
+def percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def summary(samples):
+    return (
+        f'median {statistics.median(samples):8.2f} ms  '
+        f'p95 {percentile(samples, 95):8.2f} ms  '
+        f'max {max(samples):8.2f} ms'
+    )
@@ -0,0 +1,190 @@
+"""
+PostgreSQL backend that borrows connections from an in-process pool
+instead of opening one per request. Enable it with
+ENGINE = 'foodgram_backend.postgresql_pool' and size it with the POOL
+entry of the database settings (MIN_SIZE, MAX_SIZE, TIMEOUT).
+"""
+from collections import deque
+import threading
+
+from django.db.backends.postgresql import base
+import psycopg2.extensions
+import psycopg2.extras
+
+Database = base.Database
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Keeps up to max_size open connections. Callers wait up to timeout
+    seconds for a free one; checkouts, waits, timeouts and discarded
+    connections are counted.
+    """
+
+    def __init__(self, connect, min_size, max_size, timeout, health_checks):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_checks = health_checks
+        self._idle = deque(connect() for _ in range(min(min_size, max_size)))
+        self._lock = threading.Lock()
+        # Free slots are handed to waiting callers in arrival order.
+        self._free_slots = max_size
+        self._waiters = deque()
+        self._in_use = 0
+        self._stats = {
+            'checkouts': 0, 'waits': 0, 'timeouts': 0, 'discarded': 0
+        }
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def getconn(self):
+        self._acquire_slot()
+        try:
+            conn = self._take_idle()
+            if conn is None:
+                conn = self.connect()
+        except Exception:
+            self._release_slot()
+            raise
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._in_use += 1
+        return conn
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn = self._idle.pop()
+            if self._is_usable(conn):
+                return conn
+            self._count('discarded')
+            conn.close()
+
+    def putconn(self, conn, close=False):
+        try:
+            if not (close or conn.closed):
+                try:
+                    if (conn.info.transaction_status
+                            != psycopg2.extensions.TRANSACTION_STATUS_IDLE):
+                        conn.rollback()
+                except Database.Error:
+                    pass
+                else:
+                    with self._lock:
+                        self._idle.append(conn)
+                    return
+            conn.close()
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._release_slot()
+
+    def _acquire_slot(self):
+        with self._lock:
+            if self._free_slots and not self._waiters:
+                self._free_slots -= 1
+                return
+            granted = threading.Event()
+            self._waiters.append(granted)
+            self._stats['waits'] += 1
+        if granted.wait(self.timeout):
+            return
+        with self._lock:
+            # The slot may have been handed over right after the timeout.
+            if granted.is_set():
+                return
+            self._waiters.remove(granted)
+            self._stats['timeouts'] += 1
+        raise Database.OperationalError(
+            f'No free database connection within {self.timeout}s'
+        )
+
+    def _release_slot(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._free_slots += 1
+
+    def _is_usable(self, conn):
+        if conn.closed:
+            return False
+        if not self.health_checks:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not conn.autocommit:
+                conn.rollback()
+        except Database.Error:
+            return False
+        return True
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self._stats,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+            }
+
+
+def get_pool_stats():
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.get_stats() for alias, pool in pools.items()}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_pool(self, conn_params):
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                options = self.settings_dict.get('POOL', {})
+
+                def connect():
+                    connection = Database.connect(**conn_params)
+                    # Same as the stock backend, see get_new_connection().
+                    psycopg2.extras.register_default_jsonb(
+                        conn_or_curs=connection, loads=lambda x: x
+                    )
+                    return connection
+
+                pool = _pools[self.alias] = ConnectionPool(
+                    connect,
+                    min_size=options.get('MIN_SIZE', 1),
+                    max_size=options.get('MAX_SIZE', 10),
+                    timeout=options.get('TIMEOUT', 10),
+                    health_checks=self.settings_dict['CONN_HEALTH_CHECKS'],
+                )
+            return pool
+
+    @base.async_unsafe
+    def get_new_connection(self, conn_params):
+        connection = self.get_pool(conn_params).getconn()
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            # Connections left in a broken state are not handed out again.
+            broken = self.errors_occurred and not self.is_usable()
+            with self.wrap_database_errors:
+                _pools[self.alias].putconn(self.connection, close=broken)
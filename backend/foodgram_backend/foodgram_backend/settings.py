@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
 
@@ -87,10 +88,131 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default="evencat"),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default="alta2002"),
         'HOST': os.getenv('DB_HOST', default="localhost"),
-        'PORT': os.getenv('DB_PORT', default="5432")
+        'PORT': os.getenv('DB_PORT', default="5432"),
+        # Keep connections open between requests, checked before reuse.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('DB_CONN_HEALTH_CHECKS', default='True') == 'True'
+        ),
+        # Used by DB_ENGINE=foodgram_backend.postgresql_pool, which shares
+        # connections between the threads of a process; run it with
+        # DB_CONN_MAX_AGE=0 so connections go back to the pool after each
+        # request.
+        'POOL': {
+            'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', default=2)),
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default=20)),
+            'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', default=10)),
+        },
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='foodgram'),
+    },
+    # Versions of the cached reference data and recipe list pages (see
+    # recipes.cache). Every process must see the same versions, so this
+    # needs a backend shared by all workers: the database (its table is
+    # created by migration), Redis or Memcached, never LocMemCache.
+    'versions': {
+        'BACKEND': os.getenv(
+            'VERSION_CACHE_BACKEND',
+            default='django.core.cache.backends.db.DatabaseCache'
+        ),
+        'LOCATION': os.getenv(
+            'VERSION_CACHE_LOCATION', default='recipes_cache_version'
+        ),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(
+                os.getenv('VERSION_CACHE_MAX_ENTRIES', default=10000)
+            ),
+        },
+    },
+    # Rendered shopping-list exports keyed by a hash of their content.
+    # LocMemCache evicts the least recently used entry past MAX_ENTRIES.
+    'shopping_list': {
+        'BACKEND': os.getenv(
+            'SHOPPING_LIST_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv(
+            'SHOPPING_LIST_CACHE_LOCATION', default='shopping-list'
+        ),
+        'TIMEOUT': int(os.getenv('SHOPPING_LIST_CACHE_TIMEOUT', default=86400)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(
+                os.getenv('SHOPPING_LIST_CACHE_MAX_ENTRIES', default=256)
+            ),
+        },
+    },
+}
+
+SHOPPING_LIST_CACHE = 'shopping_list'
+VERSION_CACHE = 'versions'
+
+# Background shopping-list exports (?async=1) are rendered by an
+# in-process thread pool and kept in the database for the given seconds.
+SHOPPING_LIST_EXPORT_WORKERS = int(
+    os.getenv('SHOPPING_LIST_EXPORT_WORKERS', default=2)
+)
+SHOPPING_LIST_EXPORT_TTL = int(
+    os.getenv('SHOPPING_LIST_EXPORT_TTL', default=86400)
+)
+
+# Serialized tags and ingredients are cached per table version, see
+# recipes.cache.
+REFERENCE_CACHE_TIMEOUT = 86400
+
+# Anonymous recipe list pages, invalidated through recipes.cache versions.
+RECIPE_LIST_CACHE_TIMEOUT = int(
+    os.getenv('RECIPE_LIST_CACHE_TIMEOUT', default=300)
+)
+
+# Views with count_strategy = 'approximate' count filtered lists up to the
+# cap and keep the result for the timeout in seconds.
+PAGINATION_COUNT_CAP = 1000
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Uploaded recipe images: limits of the decoded original and the resized
+# variants, as (width, height) boxes, built by an in-process thread pool.
+RECIPE_IMAGE_MAX_BYTES = int(
+    os.getenv('RECIPE_IMAGE_MAX_BYTES', default=10 * 1024 * 1024)
+)
+RECIPE_IMAGE_MAX_DIMENSION = 6000
+RECIPE_IMAGE_VARIANTS = {
+    'thumbnail': (160, 160),
+    'card': (480, 480),
+    'detail': (1200, 1200),
+}
+RECIPE_IMAGE_WORKERS = int(os.getenv('RECIPE_IMAGE_WORKERS', default=2))
+
+# Ingredient autocomplete (?name=): default/maximum number of results and
+# the in-process cache of results for the most recently typed prefixes.
+INGREDIENT_SEARCH_LIMIT = 20
+INGREDIENT_SEARCH_MAX_LIMIT = 100
+INGREDIENT_SEARCH_CACHE_SIZE = 1024
+INGREDIENT_SEARCH_CACHE_TIMEOUT = 300
+
+# Recipe search (?search=) returns at most this many matches, ranked:
+# those matching by name first, then the newest of the others. When more
+# recipes match, the response has "search_truncated": true, and its count
+# and pages cover the returned matches only.
+RECIPE_SEARCH_CANDIDATES = int(
+    os.getenv('RECIPE_SEARCH_CANDIDATES', default=300)
+)
+
+# Serve GET requests of tags, ingredients, recipes and subscriptions with
+# async views, see api.async_views. Meant for the ASGI application, e.g.
+# gunicorn foodgram_backend.asgi:application -k uvicorn.workers.UvicornWorker
+# together with the pooled database engine and DB_CONN_MAX_AGE=0, as ASGI
+# requests run their queries in short-lived threads.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', default='False') == 'True'
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -116,6 +238,15 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 1
 }
@@ -143,6 +274,13 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Host the API builds media links for, e.g. a CDN. With a signing key the
+# links carry nginx secure_link md5/expires arguments valid for one to two
+# TTL windows.
+MEDIA_BASE_URL = os.getenv('MEDIA_BASE_URL', default='http://51.250.102.77')
+MEDIA_URL_SIGNING_KEY = os.getenv('MEDIA_URL_SIGNING_KEY', default='')
+MEDIA_URL_SIGNING_TTL = int(os.getenv('MEDIA_URL_SIGNING_TTL', default=86400))
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
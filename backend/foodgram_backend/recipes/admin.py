@@ -12,18 +12,28 @@ class TagAdmin(admin.ModelAdmin):
     )
 
 
+class RecipeIngredientsInline(admin.TabularInline):
+    model = RecipeIngredients
+    autocomplete_fields = ("ingredient",)
+    extra = 1
+
+
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     list_display = (
         "name",
         "author",
+        "favorites_count",
+        "in_carts_count",
     )
     list_filter = (
         "author",
         "name",
         "tag",
     )
-    readonly_fields = ("wish_list_count",)
+    list_select_related = ("author",)
+    readonly_fields = ("favorites_count", "in_carts_count")
+    inlines = (RecipeIngredientsInline,)
 
 
 @admin.register(Ingredient)
@@ -33,8 +43,10 @@ class IngridientAdmin(admin.ModelAdmin):
         "measurement_unit",
     )
     list_filter = ("name",)
+    search_fields = ("name",)
 
 
 @admin.register(RecipeIngredients)
 class RecipeIngredients(admin.ModelAdmin):
-    list_display = ("ingredient", "weight")
+    list_display = ("recipe", "ingredient", "weight")
+    list_select_related = ("recipe", "ingredient")
@@ -0,0 +1,87 @@
+import time
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+TAGS = 'tags'
+INGREDIENTS = 'ingredients'
+
+# Versions of the public recipe list: any recipe change bumps RECIPES,
+# the author's and the tags' versions; profile edits bump RECIPE_AUTHORS.
+# Counter versions cover the orderings by favorites_count and the like.
+RECIPES = 'recipes'
+RECIPE_AUTHORS = 'recipes:authors'
+
+
+def recipe_author_version(author_id):
+    return f'recipes:author:{author_id}'
+
+
+def recipe_tag_version(slug):
+    return f'recipes:tag:{slug}'
+
+
+def recipe_counter_version(counter):
+    return f'recipes:counter:{counter}'
+
+
+def _version_key(name):
+    return f'reference:{name}:version'
+
+
+def get_versions(names) -> dict:
+    """
+    Timestamps of the last change of the given data sets, shared by all
+    processes through the version cache.
+    """
+    cache = caches[settings.VERSION_CACHE]
+    keys = {_version_key(name): name for name in names}
+    versions = cache.get_many(keys)
+    for key in keys.keys() - versions.keys():
+        cache.add(key, time.time(), None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+async def aget_versions(names) -> dict:
+    cache = caches[settings.VERSION_CACHE]
+    keys = {_version_key(name): name for name in names}
+    versions = await cache.aget_many(keys)
+    for key in keys.keys() - versions.keys():
+        await cache.aadd(key, time.time(), None)
+        versions[key] = await cache.aget(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_versions(names):
+    now = time.time()
+    caches[settings.VERSION_CACHE].set_many(
+        {_version_key(name): now for name in names}, None
+    )
+
+
+def get_reference_version(name) -> float:
+    return get_versions((name,))[name]
+
+
+async def aget_reference_version(name) -> float:
+    return (await aget_versions((name,)))[name]
+
+
+def bump_reference_version(name):
+    bump_versions((name,))
+
+
+@checks.register(checks.Tags.caches)
+def check_version_cache(app_configs, **kwargs):
+    if isinstance(caches[settings.VERSION_CACHE], LocMemCache):
+        return [checks.Warning(
+            'The version cache is local to each process, so cached tags, '
+            'ingredients and recipe pages go stale in other workers.',
+            hint='Use a shared backend for CACHES[%r], e.g. DatabaseCache '
+                 'or RedisCache.' % settings.VERSION_CACHE,
+            id='recipes.W001',
+        )]
+    return []
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from users.models import Follow
+
+from .models import Recipe
+
+User = get_user_model()
+
+# (model, counter field): (counted model, its foreign key to model)
+COUNTERS = {
+    (Recipe, "favorites_count"): (User.wish_list.through, "recipe"),
+    (Recipe, "in_carts_count"): (User.shop_list.through, "recipe"),
+    (User, "recipes_count"): (Recipe, "author"),
+    (User, "followers_count"): (Follow, "following"),
+}
+
+
+def increment_counter(queryset, field, value=1):
+    queryset.update(**{field: F(field) + value})
+
+
+def decrement_counter(queryset, field, value=1):
+    queryset.filter(**{f"{field}__gte": value}).update(**{field: F(field) - value})
+
+
+def actual_count(model, field):
+    counted_model, foreign_key = COUNTERS[(model, field)]
+    counts = (
+        counted_model.objects.filter(**{foreign_key: OuterRef("pk")})
+        .order_by()
+        .values(foreign_key)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def recount(model, field, batch_size=1000):
+    """
+    Set the counter field to the real count where they differ, batch_size
+    primary keys per UPDATE. Returns the number of repaired rows.
+    """
+    repaired = 0
+    pks = model.objects.order_by("pk").values_list("pk", flat=True)
+    last_pk = None
+    while True:
+        batch = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return repaired
+        last_pk = batch[-1]
+        repaired += (
+            model.objects.filter(pk__in=batch)
+            .exclude(**{field: actual_count(model, field)})
+            .update(**{field: actual_count(model, field)})
+        )
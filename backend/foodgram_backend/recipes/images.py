@@ -0,0 +1,191 @@
+import base64
+import binascii
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from io import BytesIO
+import logging
+from tempfile import SpooledTemporaryFile
+import threading
+import traceback
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, UnidentifiedImageError, features
+
+IMAGE_DIR = 'recipe/images'
+IMAGE_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+# base64 characters decoded per step, a multiple of 4.
+DECODE_CHUNK = 64 * 1024
+
+
+class DecodedImage(NamedTuple):
+    file: SpooledTemporaryFile
+    digest: str
+    extension: str
+
+    @property
+    def name(self):
+        return f'{IMAGE_DIR}/{self.digest}.{self.extension}'
+
+
+def decode_base64_image(data) -> DecodedImage:
+    """
+    Decode a data URI or bare base64 string into a temporary file, chunk
+    by chunk, rejecting it as soon as it exceeds RECIPE_IMAGE_MAX_BYTES.
+    The image is checked with Pillow against RECIPE_IMAGE_MAX_DIMENSION.
+    """
+    if not isinstance(data, str):
+        raise ValidationError('Изображение должно быть строкой base64')
+    if ';base64,' in data:
+        data = data.split(';base64,', 1)[1]
+    # Line breaks would shift the chunks off the 4-character boundary.
+    data = ''.join(data.split())
+
+    max_bytes = settings.RECIPE_IMAGE_MAX_BYTES
+    if len(data) // 4 * 3 > max_bytes + 2:
+        raise ValidationError('Изображение слишком большое')
+
+    buffer = SpooledTemporaryFile(max_size=1024 * 1024)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        for start in range(0, len(data), DECODE_CHUNK):
+            chunk = base64.b64decode(
+                data[start:start + DECODE_CHUNK], validate=True
+            )
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValidationError('Изображение слишком большое')
+            digest.update(chunk)
+            buffer.write(chunk)
+    except (binascii.Error, ValueError):
+        buffer.close()
+        raise ValidationError('Загрузите корректное изображение')
+
+    buffer.seek(0)
+    try:
+        with Image.open(buffer) as image:
+            image_format = image.format
+            width, height = image.size
+            image.verify()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        buffer.close()
+        raise ValidationError('Загрузите корректное изображение')
+    if image_format not in IMAGE_FORMATS:
+        buffer.close()
+        raise ValidationError('Неподдерживаемый формат изображения')
+    max_dimension = settings.RECIPE_IMAGE_MAX_DIMENSION
+    if width > max_dimension or height > max_dimension:
+        buffer.close()
+        raise ValidationError(
+            f'Размер изображения не должен превышать {max_dimension} пикселей'
+        )
+
+    buffer.seek(0)
+    return DecodedImage(buffer, digest.hexdigest(), IMAGE_FORMATS[image_format])
+
+
+def _save_once(name, content) -> str:
+    """
+    Save content under name, which is derived from the content hash,
+    unless it is stored. When a concurrent writer stored it in between,
+    the storage saves this copy under another name: it is deleted again.
+    """
+    if not default_storage.exists(name):
+        saved_name = default_storage.save(name, content)
+        if saved_name != name:
+            default_storage.delete(saved_name)
+    return name
+
+
+def store_image(image: DecodedImage) -> str:
+    """Save the original under its content hash."""
+    with image.file:
+        return _save_once(image.name, File(image.file))
+
+
+def _variant_format():
+    return ('WEBP', 'webp') if features.check('webp') else ('JPEG', 'jpg')
+
+
+def build_variants(name) -> dict:
+    """
+    Resized copies of a stored image for every RECIPE_IMAGE_VARIANTS
+    entry. Variants are named after the original, so each one is stored
+    once.
+    """
+    image_format, extension = _variant_format()
+    stem = name.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    variants = {}
+    original = None
+    try:
+        for variant, size in settings.RECIPE_IMAGE_VARIANTS.items():
+            variant_name = (
+                f'{IMAGE_DIR}/variants/{stem}-{variant}.{extension}'
+            )
+            if not default_storage.exists(variant_name):
+                if original is None:
+                    with default_storage.open(name) as file:
+                        original = Image.open(file)
+                        original.load()
+                    if original.mode not in ('RGB', 'RGBA'):
+                        original = original.convert(
+                            'RGBA' if 'transparency' in original.info
+                            else 'RGB'
+                        )
+                    if image_format == 'JPEG':
+                        original = original.convert('RGB')
+                resized = original.copy()
+                resized.thumbnail(size, Image.Resampling.LANCZOS)
+                content = BytesIO()
+                resized.save(content, image_format, quality=80)
+                _save_once(variant_name, File(content))
+            variants[variant] = variant_name
+    finally:
+        if original is not None:
+            original.close()
+    return variants
+
+
+_image_executor = None
+_image_executor_lock = threading.Lock()
+
+
+def _get_image_executor():
+    global _image_executor
+    with _image_executor_lock:
+        if _image_executor is None:
+            _image_executor = ThreadPoolExecutor(
+                max_workers=settings.RECIPE_IMAGE_WORKERS,
+                thread_name_prefix='recipe-image',
+            )
+    return _image_executor
+
+
+def run_variants(recipe_id, name):
+    from .models import Recipe
+
+    close_old_connections()
+    try:
+        variants = build_variants(name)
+        recipe = Recipe.objects.filter(pk=recipe_id).first()
+        # Skip the save if the image was replaced in the meantime.
+        if recipe is not None and recipe.image.name == name:
+            recipe.image_variants = variants
+            recipe.save(update_fields=('image_variants',))
+    except Exception:
+        logging.error(traceback.format_exc())
+    finally:
+        close_old_connections()
+
+
+def enqueue_variants(recipe):
+    """Build the image variants on the worker pool once committed."""
+    recipe_id, name = recipe.pk, recipe.image.name
+    transaction.on_commit(
+        lambda: _get_image_executor().submit(run_variants, recipe_id, name)
+    )
@@ -0,0 +1,78 @@
+import csv
+import io
+from itertools import islice
+import json
+from pathlib import Path
+
+
+def read_rows(path, fields):
+    """
+    Yield reference rows from a headerless CSV file (columns in the order
+    of fields), read line by line, or from a JSON list of objects.
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, encoding='utf-8') as file:
+            for item in json.load(file):
+                yield tuple(str(item[field]).strip() for field in fields)
+        return
+
+    with open(path, encoding='utf-8', newline='') as file:
+        for row in csv.reader(file):
+            if len(row) < len(fields):
+                continue
+            yield tuple(value.strip() for value in row[:len(fields)])
+
+
+def unique_rows(rows, key):
+    seen = set()
+    for row in rows:
+        row_key = key(row)
+        if row_key in seen:
+            continue
+        seen.add(row_key)
+        yield row
+
+
+def batched(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CSVStream(io.RawIOBase):
+    """File-like view of an iterator of rows for COPY ... FROM STDIN."""
+
+    chunk_rows = 1000
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.rows_read = 0
+        self._buffer = bytearray()
+        self._text = io.StringIO()
+        self._writer = csv.writer(self._text)
+
+    def readable(self):
+        return True
+
+    def _fill(self):
+        self._text.seek(0)
+        self._text.truncate()
+        chunk = list(islice(self._rows, self.chunk_rows))
+        self._writer.writerows(chunk)
+        self.rows_read += len(chunk)
+        self._buffer += self._text.getvalue().encode('utf-8')
+        return bool(chunk)
+
+    def readinto(self, buffer):
+        while len(self._buffer) < len(buffer) and self._fill():
+            pass
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
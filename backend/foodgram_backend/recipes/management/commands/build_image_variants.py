@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from recipes.images import build_variants
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = 'Build the resized image variants of recipes that lack them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Also process recipes that already have variants.'
+        )
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.exclude(image='').only('id', 'image')
+        if not options['all']:
+            recipes = recipes.filter(image_variants={})
+        built = 0
+        for recipe in recipes.iterator():
+            try:
+                recipe.image_variants = build_variants(recipe.image.name)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'{recipe.image.name}: {error}')
+                continue
+            recipe.save(update_fields=('image_variants',))
+            built += 1
+        self.stdout.write(f'{built} recipes updated')
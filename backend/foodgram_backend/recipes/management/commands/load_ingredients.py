@@ -0,0 +1,82 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from recipes.cache import INGREDIENTS, bump_reference_version
+from recipes.loaders import CSVStream, batched, read_rows, unique_rows
+from recipes.models import Ingredient
+
+FIELDS = ('name', 'measurement_unit')
+
+
+class Command(BaseCommand):
+    help = (
+        'Load ingredients from a CSV or JSON file. Rows already present '
+        '(same name and measurement unit) are skipped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default=settings.BASE_DIR.parent.parent / 'data' / 'ingredients.csv',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rows = unique_rows(
+            (row for row in read_rows(options['path'], FIELDS) if row[0]),
+            key=lambda row: row,
+        )
+
+        with transaction.atomic():
+            count_before = Ingredient.objects.count()
+            if connection.vendor == 'postgresql':
+                processed = self._copy(rows)
+            else:
+                processed = self._bulk_create(rows, options['batch_size'])
+            created = Ingredient.objects.count() - count_before
+
+        bump_reference_version(INGREDIENTS)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Read {processed} rows, created {created} ingredients '
+            f'in {elapsed:.2f}s ({processed / max(elapsed, 1e-6):.0f} rows/s)'
+        ))
+
+    def _copy(self, rows):
+        stream = CSVStream(rows)
+        table = Ingredient._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMPORARY TABLE ingredients_load '
+                '(name varchar(200), measurement_unit varchar(200)) '
+                'ON COMMIT DROP'
+            )
+            cursor.copy_expert(
+                'COPY ingredients_load (name, measurement_unit) '
+                'FROM STDIN WITH (FORMAT csv)',
+                stream,
+            )
+            cursor.execute(
+                f'INSERT INTO {table} (name, measurement_unit) '
+                'SELECT name, measurement_unit FROM ingredients_load '
+                'ON CONFLICT (name, measurement_unit) DO NOTHING'
+            )
+        return stream.rows_read
+
+    def _bulk_create(self, rows, batch_size):
+        processed = 0
+        for batch in batched(rows, batch_size):
+            Ingredient.objects.bulk_create(
+                [Ingredient(name=name, measurement_unit=unit)
+                 for name, unit in batch],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+            processed += len(batch)
+        return processed
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.cache import TAGS, bump_reference_version
+from recipes.loaders import read_rows, unique_rows
+from recipes.models import Tag
+
+FIELDS = ('name', 'color', 'slug')
+
+
+class Command(BaseCommand):
+    help = (
+        'Load tags from a CSV (name,color,slug) or JSON file. Existing tags '
+        'are matched by slug and get their name and color updated.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        tags = [
+            Tag(name=name, color=color, slug=slug)
+            for name, color, slug in unique_rows(
+                read_rows(options['path'], FIELDS), key=lambda row: row[2]
+            )
+        ]
+
+        with transaction.atomic():
+            Tag.objects.bulk_create(
+                tags,
+                update_conflicts=True,
+                unique_fields=('slug',),
+                update_fields=('name', 'color'),
+            )
+
+        bump_reference_version(TAGS)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {len(tags)} tags in {elapsed:.2f}s '
+            f'({len(tags) / max(elapsed, 1e-6):.0f} rows/s)'
+        ))
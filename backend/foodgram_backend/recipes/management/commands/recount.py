@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from recipes.counters import COUNTERS, recount
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalculate the denormalized favorites, cart, recipes and followers '
+        'counters and fix the rows that drifted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        for model, field in COUNTERS:
+            repaired = recount(model, field, options['batch_size'])
+            self.stdout.write(
+                f'{model._meta.label}.{field}: {repaired} rows repaired'
+            )
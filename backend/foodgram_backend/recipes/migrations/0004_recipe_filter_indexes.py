@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_shoppinglistexport'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', '-created'], name='recipe_author_created_idx'),
+        ),
+        # The auto-created M2M table is only indexed on (recipe_id, tag_id)
+        # and on each column separately; tag filtering starts from tag_id.
+        migrations.RunSQL(
+            sql='CREATE INDEX recipe_tag_tag_recipe_idx '
+                'ON recipes_recipe_tag (tag_id, recipe_id);',
+            reverse_sql='DROP INDEX recipe_tag_tag_recipe_idx;',
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_filter_indexes'),
+    ]
+
+    operations = [
+        # Matches UPPER("name"::text) LIKE UPPER('...%') emitted by
+        # name__istartswith on PostgreSQL.
+        migrations.RunSQL(
+            sql='CREATE INDEX ingredient_name_upper_like_idx '
+                'ON recipes_ingredient (UPPER(name::text) text_pattern_ops);',
+            reverse_sql='DROP INDEX ingredient_name_upper_like_idx;',
+        ),
+    ]
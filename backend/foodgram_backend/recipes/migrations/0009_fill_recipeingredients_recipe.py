@@ -0,0 +1,76 @@
+from django.db import migrations
+from django.db.models import Count, Min, Sum
+
+BATCH_SIZE = 1000
+
+
+def fill_recipe(apps, schema_editor):
+    """
+    Attach every amount row to the recipe that links to it. Rows shared by
+    several recipes are copied so that each recipe owns its own amounts.
+    """
+    Recipe = apps.get_model('recipes', 'Recipe')
+    RecipeIngredients = apps.get_model('recipes', 'RecipeIngredients')
+    Link = Recipe.ingredients.through
+
+    last_id = 0
+    while True:
+        links = list(
+            Link.objects.filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', 'recipe_id', 'recipeingredients_id')[:BATCH_SIZE]
+        )
+        if not links:
+            break
+        last_id = links[-1][0]
+
+        rows = RecipeIngredients.objects.in_bulk(
+            [row_id for _, _, row_id in links]
+        )
+        claimed, copies = [], []
+        for _, recipe_id, row_id in links:
+            row = rows[row_id]
+            if row.recipe_id is None:
+                row.recipe_id = recipe_id
+                claimed.append(row)
+            elif row.recipe_id != recipe_id:
+                copies.append(RecipeIngredients(
+                    recipe_id=recipe_id,
+                    ingredient_id=row.ingredient_id,
+                    weight=row.weight,
+                ))
+        RecipeIngredients.objects.bulk_update(claimed, ('recipe',))
+        RecipeIngredients.objects.bulk_create(copies)
+
+    RecipeIngredients.objects.filter(recipe__isnull=True).delete()
+
+
+def merge_duplicate_amounts(apps, schema_editor):
+    RecipeIngredients = apps.get_model('recipes', 'RecipeIngredients')
+
+    duplicates = (
+        RecipeIngredients.objects
+        .values('recipe_id', 'ingredient_id')
+        .annotate(kept_id=Min('id'), total=Count('id'), weight=Sum('weight'))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates.iterator(chunk_size=BATCH_SIZE):
+        RecipeIngredients.objects.filter(id=duplicate['kept_id']).update(
+            weight=duplicate['weight']
+        )
+        RecipeIngredients.objects.filter(
+            recipe_id=duplicate['recipe_id'],
+            ingredient_id=duplicate['ingredient_id'],
+        ).exclude(id=duplicate['kept_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipeingredients_recipe'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_recipe, migrations.RunPython.noop),
+        migrations.RunPython(merge_duplicate_amounts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_recipe_created_id_idx'),
+        ('users', '0002_follow_followers_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='favorites count'),
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='in_carts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='in carts count'),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE recipes_recipe SET '
+                'favorites_count = (SELECT COUNT(*) FROM users_user_wish_list '
+                'WHERE users_user_wish_list.recipe_id = recipes_recipe.id), '
+                'in_carts_count = (SELECT COUNT(*) FROM users_user_shop_list '
+                'WHERE users_user_shop_list.recipe_id = recipes_recipe.id);',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['-favorites_count', '-created'], name='recipe_popular_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0013_recipe_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # Same document as recipes.search.get_search_vector().
+        migrations.RunSQL(
+            sql="UPDATE recipes_recipe SET search_vector = "
+                "setweight(to_tsvector('russian', COALESCE(name, '')), 'A') || "
+                "setweight(to_tsvector('russian', COALESCE(("
+                "SELECT STRING_AGG(recipes_ingredient.name, ' ') "
+                "FROM recipes_recipeingredients "
+                "JOIN recipes_ingredient "
+                "ON recipes_ingredient.id = recipes_recipeingredients.ingredient_id "
+                "WHERE recipes_recipeingredients.recipe_id = recipes_recipe.id"
+                "), '')), 'B') || "
+                "setweight(to_tsvector('russian', COALESCE(text, '')), 'C');",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='recipe_search_idx'),
+        ),
+    ]
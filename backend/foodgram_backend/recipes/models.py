@@ -1,9 +1,9 @@
 from django.db import models
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator
-from django.db import models, router
-from django.db.models.deletion import Collector
 from django.utils.html import format_html
 
 from foodgram_backend import settings
@@ -21,37 +21,47 @@ class Recipe(models.Model):
     image = models.ImageField(
         upload_to="recipe/images",
     )
+    # Variant name -> storage path, filled by recipes.images.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     cooking_time = models.IntegerField(
         validators=[
             MinValueValidator(1, message="Время приготовления не может быть меньше 1")
         ]
     )
     ingredients = models.ManyToManyField(
-        "Recipeingredients", related_name="recipe", blank=False
+        "Ingredient", through="RecipeIngredients", related_name="recipes"
     )
     tag = models.ManyToManyField("Tag", related_name="recipe", blank=False)
-
-    def wish_list_count(self):
-        return self.user_wishlist.count()
-
-    def delete(self, using=None, keep_parents=False):
-        if self.pk is None:
-            raise ValueError(
-                "%s object can't be deleted because its %s attribute is set "
-                "to None." % (self._meta.object_name, self._meta.pk.attname)
-            )
-        using = using or router.db_for_write(self.__class__, instance=self)
-        collector = Collector(using=using, origin=self)
-        collector.collect([self], keep_parents=keep_parents)
-        for ingredient in self.ingredients.all():
-            ingredient.delete()
-        return collector.delete()
+    # Maintained by recipes.counters, repaired by the recount command.
+    favorites_count = models.PositiveIntegerField(
+        "favorites count", default=0, editable=False
+    )
+    in_carts_count = models.PositiveIntegerField(
+        "in carts count", default=0, editable=False
+    )
+    # Name, ingredient names and text, maintained by recipes.signals.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self) -> str:
         return f"{self.name}"
 
     class Meta:
         ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["author", "-created"], name="recipe_author_created_idx"
+            ),
+            models.Index(fields=["-created", "-id"], name="recipe_created_id_idx"),
+            models.Index(
+                fields=["-favorites_count", "-created"], name="recipe_popular_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="recipe_search_idx"),
+            # Name matches for search ranking, see recipes.search.
+            GinIndex(
+                SearchVector("name", config="russian"),
+                name="recipe_name_search_idx",
+            ),
+        ]
 
 
 class Ingredient(models.Model):
@@ -64,8 +74,21 @@ class Ingredient(models.Model):
     def __str__(self) -> str:
         return f"{self.name}"
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "measurement_unit"], name="unique_ingredient"
+            )
+        ]
+
 
 class RecipeIngredients(models.Model):
+    recipe = models.ForeignKey(
+        Recipe,
+        related_name="recipe_ingredients",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
     ingredient = models.ForeignKey(
         Ingredient, related_name="recipe", on_delete=models.CASCADE, unique=False
     )
@@ -76,6 +99,17 @@ class RecipeIngredients(models.Model):
     def __str__(self) -> str:
         return f"ingredient: {self.ingredient.name}"
 
+    class Meta:
+        constraints = [
+            # Also covers the shopping-list aggregation: the index alone
+            # yields (recipe, ingredient, weight) without heap lookups.
+            models.UniqueConstraint(
+                fields=["recipe", "ingredient"],
+                include=["weight"],
+                name="unique_recipe_ingredient",
+            )
+        ]
+
 
 class Tag(models.Model):
     name = models.CharField(
@@ -90,3 +124,32 @@ class Tag(models.Model):
 
     def __str__(self) -> str:
         return f"{self.name}"
+
+
+class ShoppingListExport(models.Model):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "В очереди"),
+        (DONE, "Готово"),
+        (FAILED, "Ошибка"),
+    )
+
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="shopping_list_exports",
+    )
+    export_format = models.CharField(max_length=3)
+    status = models.CharField(
+        max_length=7, choices=STATUS_CHOICES, default=PENDING
+    )
+    content = models.BinaryField(null=True, editable=False)
+
+    def __str__(self) -> str:
+        return f"{self.user} {self.export_format} ({self.status})"
+
+    class Meta:
+        ordering = ["-created"]
@@ -0,0 +1,37 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db.models import OuterRef, Subquery
+
+from .models import RecipeIngredients
+
+SEARCH_CONFIG = 'russian'
+
+
+def get_search_vector():
+    """
+    Document of a recipe for full-text search: the name weighs most,
+    then the ingredient names, then the text.
+    """
+    ingredient_names = (
+        RecipeIngredients.objects
+        .filter(recipe=OuterRef('pk'))
+        .values('recipe')
+        .annotate(names=StringAgg('ingredient__name', ' '))
+        .values('names')
+    )
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(
+            Subquery(ingredient_names), weight='B', config=SEARCH_CONFIG
+        )
+        + SearchVector('text', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def get_name_vector():
+    """Recipe name alone, indexed by recipe_name_search_idx."""
+    return SearchVector('name', config=SEARCH_CONFIG)
+
+
+def update_search_vectors(recipes):
+    recipes.update(search_vector=get_search_vector())
@@ -0,0 +1,149 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+
+from users.models import Follow
+
+from .cache import (
+    INGREDIENTS,
+    RECIPE_AUTHORS,
+    RECIPES,
+    TAGS,
+    bump_reference_version,
+    bump_versions,
+    recipe_author_version,
+    recipe_tag_version
+)
+from .counters import decrement_counter, increment_counter
+from .models import Ingredient, Recipe, Tag
+from .search import update_search_vectors
+
+User = get_user_model()
+
+
+# Bump after commit so that no process caches the old rows under the new
+# version.
+@receiver((post_save, post_delete), sender=Tag)
+def invalidate_tags(**kwargs):
+    transaction.on_commit(lambda: bump_reference_version(TAGS))
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def invalidate_ingredients(**kwargs):
+    transaction.on_commit(lambda: bump_reference_version(INGREDIENTS))
+
+
+def _invalidate_recipe_list(author_ids=(), tag_slugs=()):
+    names = [RECIPES]
+    names += [recipe_author_version(author_id) for author_id in author_ids]
+    names += [recipe_tag_version(slug) for slug in tag_slugs]
+    transaction.on_commit(lambda: bump_versions(names))
+
+
+@receiver(post_save, sender=Recipe)
+def invalidate_saved_recipe(instance, created, **kwargs):
+    tag_slugs = () if created else instance.tag.values_list('slug', flat=True)
+    _invalidate_recipe_list((instance.author_id,), list(tag_slugs))
+
+
+# The tag links are gone by post_delete, so collect them beforehand.
+@receiver(pre_delete, sender=Recipe)
+def invalidate_deleted_recipe(instance, **kwargs):
+    _invalidate_recipe_list(
+        (instance.author_id,),
+        list(instance.tag.values_list('slug', flat=True))
+    )
+
+
+@receiver(m2m_changed, sender=Recipe.tag.through)
+def invalidate_recipe_tags(instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        recipes = instance.recipe.all() if pk_set is None else (
+            Recipe.objects.filter(pk__in=pk_set)
+        )
+        author_ids = recipes.values_list('author_id', flat=True).distinct()
+        _invalidate_recipe_list(list(author_ids), (instance.slug,))
+        return
+    tags = instance.tag.all() if pk_set is None else (
+        Tag.objects.filter(pk__in=pk_set)
+    )
+    _invalidate_recipe_list(
+        (instance.author_id,), list(tags.values_list('slug', flat=True))
+    )
+
+
+# Author data is embedded in every recipe, but logins only touch
+# last_login and do not need to drop anything.
+@receiver(post_save, sender=User)
+def invalidate_recipe_authors(created, update_fields, **kwargs):
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    transaction.on_commit(lambda: bump_versions((RECIPE_AUTHORS,)))
+
+
+# Recipes and follows are also created and deleted from the admin and by
+# cascades, so their counters follow the model signals.
+@receiver(post_save, sender=Recipe)
+def count_created_recipe(instance, created, **kwargs):
+    if created:
+        increment_counter(
+            User.objects.filter(pk=instance.author_id), 'recipes_count'
+        )
+
+
+@receiver(post_delete, sender=Recipe)
+def count_deleted_recipe(instance, **kwargs):
+    decrement_counter(
+        User.objects.filter(pk=instance.author_id), 'recipes_count'
+    )
+
+
+@receiver(post_save, sender=Follow)
+def count_created_follow(instance, created, **kwargs):
+    if created:
+        increment_counter(
+            User.objects.filter(pk=instance.following_id), 'followers_count'
+        )
+
+
+@receiver(post_delete, sender=Follow)
+def count_deleted_follow(instance, **kwargs):
+    decrement_counter(
+        User.objects.filter(pk=instance.following_id), 'followers_count'
+    )
+
+
+# The search document includes the ingredient names, which the API and the
+# admin inline save after the recipe itself: index on commit.
+@receiver(post_save, sender=Recipe)
+def index_saved_recipe(instance, update_fields, **kwargs):
+    if update_fields and not set(update_fields) & {'name', 'text'}:
+        return
+    recipes = Recipe.objects.filter(pk=instance.pk)
+    transaction.on_commit(lambda: update_search_vectors(recipes))
+
+
+@receiver(post_save, sender=Ingredient)
+def index_renamed_ingredient(instance, created, update_fields, **kwargs):
+    if created or (update_fields and 'name' not in update_fields):
+        return
+    recipes = Recipe.objects.filter(ingredients=instance)
+    transaction.on_commit(lambda: update_search_vectors(recipes))
+
+
+# The recipes lose the ingredient by post_delete, so collect them
+# beforehand.
+@receiver(pre_delete, sender=Ingredient)
+def index_deleted_ingredient(instance, **kwargs):
+    recipe_ids = list(instance.recipes.values_list('pk', flat=True))
+    transaction.on_commit(lambda: update_search_vectors(
+        Recipe.objects.filter(pk__in=recipe_ids)
+    ))
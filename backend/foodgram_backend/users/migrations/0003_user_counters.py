@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_follow_followers_created_idx'),
+        ('recipes', '0011_recipe_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='recipes count'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='followers count'),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE users_user SET '
+                'recipes_count = (SELECT COUNT(*) FROM recipes_recipe '
+                'WHERE recipes_recipe.author_id = users_user.id), '
+                'followers_count = (SELECT COUNT(*) FROM users_follow '
+                'WHERE users_follow.following_id = users_user.id);',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
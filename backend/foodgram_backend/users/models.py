@@ -38,6 +38,13 @@ class User(AbstractUser):
         related_name="user_shoplist",
         blank=True,
     )
+    # Maintained by recipes.counters, repaired by the recount command.
+    recipes_count = models.PositiveIntegerField(
+        "recipes count", default=0, editable=False
+    )
+    followers_count = models.PositiveIntegerField(
+        "followers count", default=0, editable=False
+    )
 
     def clean(self) -> None:
         if self.username == "me":
@@ -66,6 +73,12 @@ class Follow(models.Model):
             )
         ]
         ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["followers", "-created", "-id"],
+                name="follow_followers_created_idx",
+            ),
+        ]
 
     def clean(self) -> None:
         if self.followers == self.following: